@@ -1,62 +1,343 @@
 # app.py (Deluxe GUI - fixed)
-# Bug fix: implement _load_presets method so constructor call doesn't fall back to tkinter.__getattr__
-# and raise AttributeError. This version adds _load_presets back into the FreePoopApp class.
+# Presets are read off the Tk thread (_load_presets_bg -> _read_presets) and applied via the ui queue.
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import threading
+import asyncio
+import queue
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import os
 from pathlib import Path
 import json
+import gzip
+import pickle
+import hashlib
+import importlib
+import functools
 import time
+import random
 import sys
 
-from ytpffmpeg_adaptor import YTPFFmpegAdaptor
-
 # Optional modules
 try:
-    import plugin_manager as pm_mod
+    import orjson  # faster JSON parsing for presets; stdlib json is the fallback
 except Exception:
-    pm_mod = None
-
-try:
-    import speech_to_text as stt_mod
-except Exception:
-    stt_mod = None
+    orjson = None
 
 APP_TITLE = "FreePoop V2 - Deluxe (updated, fixed)"
+LOG_MAX_LINES = 2000  # log widget is trimmed back below this so inserts stay cheap
+LOG_TRIM_LINES = 500
+_HERE = Path(__file__).resolve().parent
+_PRESETS_FILE = _HERE / "presets.json"
+_PRESETS_CACHE_FILE = _HERE / ".presets.cache.pkl"
+_PROJECT_FILETYPES = [("FreePoop project", "*.json"), ("FreePoop project (compressed)", "*.json.gz")]
+_PROJECT_COMPACT_ITEMS = 50  # above this many sources+overlays, save without indentation
+TRANSCRIPT_CACHE_DIR = Path.home() / ".cache" / "freepoop" / "transcripts"
+
+# Heavier optional modules (speech_to_text may pull in whisper/torch) are imported
+# on first use so they don't delay the first paint.
+_optional_mods = {}
+
+_adaptor_cls = None
+
+def _get_adaptor_cls():
+    """Import ytpffmpeg_adaptor (and its yt-dlp/plugin imports) on first use, not at app import."""
+    global _adaptor_cls
+    if _adaptor_cls is None:
+        from ytpffmpeg_adaptor import YTPFFmpegAdaptor
+        _adaptor_cls = YTPFFmpegAdaptor
+    return _adaptor_cls
+
+def _needs_adaptor(method):
+    """For Tk callbacks: do nothing (but say so) until the background startup has built the adaptor."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.adaptor is None:
+            self.log("Still starting up, try again in a moment.")
+            return None
+        return method(self, *args, **kwargs)
+    return wrapper
+
+def _optional_import(name: str):
+    """Import an optional module once; returns None if it or its dependencies are missing."""
+    if name not in _optional_mods:
+        try:
+            _optional_mods[name] = importlib.import_module(name)
+        except Exception as e:
+            print(f"[FreePoopApp] optional module {name} unavailable: {e}", file=sys.stderr)
+            _optional_mods[name] = None
+    return _optional_mods[name]
+
+def _transcript_cache_path(src: Path) -> Path:
+    """Cache file for a source's transcript; the key changes whenever the file does."""
+    st = src.stat()
+    key = hashlib.blake2b(f"{src.resolve()}:{st.st_mtime_ns}:{st.st_size}".encode("utf-8"), digest_size=16).hexdigest()
+    return TRANSCRIPT_CACHE_DIR / f"{key}.txt"
+
+class VirtualList(tk.Frame):
+    """
+    Listbox-like view over a plain Python list backed by a ttk.Treeview.
+    Only the rows that fit in the view are inserted into Tk; scrolling re-renders
+    that window from self.items, so redraw cost stays O(visible) for long lists.
+    Offers the subset of the Listbox API the app uses (insert/delete/get/curselection/size).
+    """
+    def __init__(self, master, heading: str = "", height: int = 8, width: int = 360):
+        super().__init__(master)
+        self.items = []
+        self._rows = height
+        self._offset = 0
+        self._selected = None  # index into self.items
+        self.tree = ttk.Treeview(self, columns=("path",), show="headings", height=height, selectmode="browse")
+        self.tree.heading("path", text=heading, anchor="w")
+        self.tree.column("path", width=width, stretch=True, anchor="w")
+        self.scroll = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scroll.pack(side="right", fill="y")
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_to(self._offset - 1))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_to(self._offset + 1))
+        # only a window of rows exists in Tk, so arrow keys must walk the model themselves
+        self.tree.bind("<Up>", lambda e: self._step_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._step_selection(1))
+        self._render()
+
+    # ----- Listbox-compatible API -----
+    def size(self) -> int:
+        return len(self.items)
+
+    def insert(self, index, *values):
+        pos = len(self.items) if index == "end" else int(index)
+        self.items[pos:pos] = [str(v) for v in values]
+        if self._selected is not None and self._selected >= pos:
+            self._selected += len(values)
+        self._render()
+
+    def delete(self, first, last=None):
+        first = int(first)
+        if last is None:
+            stop = first + 1
+        elif last == "end":
+            stop = len(self.items)
+        else:
+            stop = int(last) + 1
+        del self.items[first:stop]
+        if self._selected is not None:
+            if first <= self._selected < stop:
+                self._selected = None
+            elif self._selected >= stop:
+                self._selected -= stop - first
+        self._scroll_to(self._offset)
+
+    def get(self, index) -> str:
+        return self.items[int(index)]
+
+    def curselection(self):
+        return () if self._selected is None else (self._selected,)
+
+    def selection_set(self, index):
+        self._selected = int(index)
+        # scroll just enough to bring the selection into the rendered window
+        if self._selected < self._offset:
+            self._offset = self._selected
+        elif self._selected >= self._offset + self._rows:
+            self._offset = self._selected - self._rows + 1
+        self._scroll_to(self._offset)
+
+    # ----- windowed rendering -----
+    def _render(self):
+        self.tree.delete(*self.tree.get_children())
+        end = min(len(self.items), self._offset + self._rows)
+        for i in range(self._offset, end):
+            self.tree.insert("", "end", iid=str(i), values=(self.items[i],))
+        if self._selected is not None and self._offset <= self._selected < end:
+            self.tree.selection_set(str(self._selected))
+        n = len(self.items)
+        if n:
+            self.scroll.set(self._offset / n, end / n)
+        else:
+            self.scroll.set(0.0, 1.0)
+
+    def _scroll_to(self, offset: int):
+        self._offset = max(0, min(int(offset), max(0, len(self.items) - self._rows)))
+        self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(round(float(amount) * len(self.items)))
+        elif action == "scroll":
+            step = self._rows if unit == "pages" else 1
+            self._scroll_to(self._offset + int(amount) * step)
+
+    def _on_wheel(self, event):
+        self._scroll_to(self._offset - (1 if event.delta > 0 else -1) * 3)
+        return "break"
+
+    def _step_selection(self, delta: int):
+        if self.items:
+            cur = self._selected if self._selected is not None else (-1 if delta > 0 else len(self.items))
+            self.selection_set(max(0, min(len(self.items) - 1, cur + delta)))
+        return "break"
+
+    def _on_select(self, _event=None):
+        # re-rendering clears the Tk selection; only a real pick changes the model selection
+        sel = self.tree.selection()
+        if sel:
+            self._selected = int(sel[0])
+
 
 class FreePoopApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title(APP_TITLE)
         self.geometry("1200x760")
-        self.adaptor = YTPFFmpegAdaptor()
-        self.presets = {}
-        # load presets before building UI so UI can reflect presets if needed
-        self._load_presets()
+        # the adaptor import and plugin discovery run on a worker once the window
+        # is up (see _build_adaptor_bg); until then the models are empty lists
+        self.adaptor = None
+        self._sources_model = []
+        self._overlays_model = []
+        self.presets = {}  # filled in by _load_presets_bg once the window is up
+        self._preset_apply = {}  # preset name -> closure built by _make_preset_applier
         self.batch_jobs = []  # list of (out_path, preset_name)
+        # worker threads never touch Tk directly; they post here and the Tk thread drains it
+        self._ui_q = queue.Queue()
+        self._tk_thread = threading.get_ident()
+        # log lines are buffered and written to the Text widget in one insert per flush
+        self._log_buf = collections.deque()
+        self._log_scheduled = False
+        self._debounce_ids = {}  # key -> pending after() id, see _debounce
+        self._throttled = {}  # key -> latest (fn, args) waiting for its after() slot, see _throttle
+        # each batch job is an ffmpeg that already multithreads; don't run more than ~half the cores at once
+        self._batch_workers = max(1, (os.cpu_count() or 2) // 2)
+        self._batch_pool = ThreadPoolExecutor(max_workers=self._batch_workers, thread_name_prefix="batch")
+        # long-running jobs (STT, export) are coroutines on a background asyncio loop;
+        # blocking work goes through asyncio.to_thread and results come back via _ui_q
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True, name="freepoop-jobs").start()
+        # one generator for the app's lifetime; reseeding from time() per call only
+        # ever produced 65536 distinct shuffles
+        self._rng = random.Random()
+        self._gif_dlg = None  # reusable dialogs, see _gif_dialog/_batch_dialog
+        self._batch_dlg = None
+        self._last_media_dir = None  # folder of the last added source/overlay, used as initialdir
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(50, self._drain_ui_queue)
+        # preset file I/O and adaptor setup overlap with Tk's first layout pass
+        threading.Thread(target=self._load_presets_bg, daemon=True).start()
+        threading.Thread(target=self._build_adaptor_bg, daemon=True).start()
+
+    def _on_close(self):
+        # pool and to_thread workers are joined at interpreter exit; drop queued batch jobs and
+        # kill running ffmpegs so closing the window doesn't leave a headless process encoding
+        self._batch_pool.shutdown(wait=False, cancel_futures=True)
+        if self.adaptor is not None:
+            self.adaptor.terminate_exports()
+            self.adaptor.stop_preview()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.destroy()
+
+    def _build_adaptor_bg(self):
+        # runs on a worker thread; the Tk thread installs the result via the ui queue
+        try:
+            self._ui_q.put(("adaptor", _get_adaptor_cls()()))
+        except Exception as e:
+            self._ui_q.put(("log", "Startup error: " + str(e)))
+            self._ui_q.put(("dialog", "error", "Startup error", str(e)))
+
+    def _install_adaptor(self, adaptor):
+        if self.adaptor is not None:
+            # New Project was used during startup and already built one
+            adaptor.cleanup()
+            return
+        if not hasattr(self, "txt_log"):
+            # the panels are still queued behind after_idle (_build_log is the last); retry after them
+            self.after_idle(self._install_adaptor, adaptor)
+            return
+        self.adaptor = adaptor
+        self._bind_models()
+        # push the widget state (defaults, or anything changed during startup) into the adaptor
+        self.update_effects()
+        self.adaptor.set_effect("pitch_semitones", float(self.sld_pitch.get()))
+        if self.presets:
+            self._apply_presets(self.presets)
+        self.refresh_plugins()
 
     # ----------------- Presets -----------------
-    def _load_presets(self):
+    def _load_presets_bg(self):
+        # runs on a worker thread; the Tk thread applies the result via the ui queue
+        self._ui_q.put(("presets", self._read_presets()))
+
+    def _apply_presets(self, presets: dict):
+        self.presets = presets
+        cmb = getattr(self, "cmb_preset", None)
+        if cmb is None or self.adaptor is None:
+            return  # effects panel or adaptor not ready yet; _build_right/_install_adaptor apply them
+        # specialise each preset once so selecting one is a single bulk update
+        self._preset_apply = {name: self._make_preset_applier(p) for name, p in presets.items()}
+        cmb["values"] = list(presets)
+        self.log(f"Loaded {len(presets)} presets.")
+
+    def _make_preset_applier(self, preset: dict):
+        """
+        Return a closure applying one preset: the effect patch and the widget values
+        are computed here, at load time, instead of on every selection.
+        """
+        effects = {k: v for k, v in preset.items() if k in self.adaptor.effects}
+        if "pitch_semitones" in effects:
+            effects["pitch_semitones"] = float(effects["pitch_semitones"])
+        checks = [(var, int(bool(preset[key]))) for var, key in
+                  ((self.chk_stutter, "stutter"), (self.chk_scramble, "scramble"), (self.chk_reverse, "reverse"))
+                  if key in preset]
+        spins = [(var, int(preset[key])) for var, key in
+                 ((self.var_stutter_ms, "stutter_ms"), (self.var_scramble_segments, "scramble_segments"))
+                 if key in preset]
+        pitch = effects.get("pitch_semitones")
+        def apply():
+            self.adaptor.set_effects(effects)
+            for var, value in checks:
+                var.set(value)
+            for var, value in spins:
+                var.set(value)
+            if pitch is not None:
+                self.sld_pitch.set(pitch)
+        return apply
+
+    def preset_selected(self):
+        name = self.cmb_preset.get()
+        apply = self._preset_apply.get(name)
+        if apply is None:
+            return
+        apply()
+        self.log(f"Preset applied: {name}")
+
+    def _read_presets(self) -> dict:
         """
-        Load presets.json from the same directory as this script.
+        Read presets.json from the same directory as this script.
+        A pickled copy (.presets.cache.pkl) is kept next to it and reused while
+        presets.json's (mtime_ns, size) is unchanged, so warm launches skip the JSON parse.
         If the file does not exist or fails to parse, fall back to builtin presets.
+        Does no Tk work, so it is safe to call from a worker thread.
         """
         try:
-            here = Path(__file__).resolve().parent
-            presets_file = here / "presets.json"
-            if presets_file.exists():
-                with presets_file.open("r", encoding="utf-8") as fh:
-                    data = json.load(fh)
-                    self.presets = data.get("presets", {})
-                    return
+            if _PRESETS_FILE.exists():
+                st = _PRESETS_FILE.stat()
+                key = (st.st_mtime_ns, st.st_size)
+                cached = self._read_presets_cache(_PRESETS_CACHE_FILE, key)
+                if cached is not None:
+                    return cached
+                raw = _PRESETS_FILE.read_bytes()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                presets = data.get("presets", {})
+                self._write_presets_cache(_PRESETS_CACHE_FILE, key, presets)
+                return presets
         except Exception as e:
             # Log to console; GUI log may not be available yet
             print(f"[FreePoopApp] warning loading presets.json: {e}", file=sys.stderr)
 
         # Fallback builtin presets
-        self.presets = {
+        return {
             "classic (2006-2009)": {
                 "stutter": True, "stutter_ms": 120, "stutter_repeats": 6,
                 "scramble": True, "scramble_segments": 8, "reverse": False,
@@ -79,8 +360,53 @@ class FreePoopApp(tk.Tk):
             }
         }
 
+    @staticmethod
+    def _read_presets_cache(cache_file: Path, key: tuple):
+        """Return cached presets if the cache was written for this presets.json key, else None."""
+        if not cache_file.exists():
+            return None
+        try:
+            with cache_file.open("rb") as fh:
+                cached = pickle.load(fh)
+            if cached.get("key") == key:
+                return cached.get("presets", {})
+        except Exception as e:
+            print(f"[FreePoopApp] ignoring unreadable presets cache: {e}", file=sys.stderr)
+        return None
+
+    @staticmethod
+    def _write_presets_cache(cache_file: Path, key: tuple, presets: dict):
+        tmp = cache_file.with_name(cache_file.name + f".{os.getpid()}.tmp")
+        try:
+            with tmp.open("wb") as fh:
+                pickle.dump({"key": key, "presets": presets}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            # atomic swap so a concurrent launch never reads a half-written cache
+            os.replace(tmp, cache_file)
+        except Exception as e:
+            # cache is an optimisation only; a read-only install dir is fine
+            print(f"[FreePoopApp] could not write presets cache: {e}", file=sys.stderr)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
     # ---------------- UI building ----------------
     def _build_ui(self):
+        """
+        Build the menu, toolbar and an empty main pane synchronously so Tk can paint
+        the window straight away; the heavier panels are queued with after_idle.
+        """
+        self._build_toolbar()
+
+        main_pane = tk.PanedWindow(self, orient="horizontal")
+        main_pane.pack(fill="both", expand=True, padx=8, pady=6)
+
+        self.after_idle(self._build_left, main_pane)
+        self.after_idle(self._build_right, main_pane)
+        self.after_idle(self._build_log)
+        # the initial plugin refresh runs from _install_adaptor, once there is a plugin manager
+
+    def _build_toolbar(self):
         # Menu
         menubar = tk.Menu(self)
         projmenu = tk.Menu(menubar, tearoff=0)
@@ -93,73 +419,102 @@ class FreePoopApp(tk.Tk):
         toolbar = tk.Frame(self)
         toolbar.pack(side="top", fill="x", padx=8, pady=6)
 
-        tk.Button(toolbar, text="Add Source", command=self.add_source).pack(side="left", padx=4)
-        tk.Button(toolbar, text="Add Overlay", command=self.add_overlay).pack(side="left", padx=4)
-        tk.Button(toolbar, text="Transcribe (STT)", command=self.transcribe_selected).pack(side="left", padx=4)
-        tk.Button(toolbar, text="Export", command=self.export).pack(side="left", padx=4)
-        tk.Button(toolbar, text="Batch Export...", command=self.batch_export_dialog).pack(side="left", padx=4)
-        tk.Button(toolbar, text="Preview", command=self.preview).pack(side="left", padx=4)
+        self._button_row(toolbar, (
+            ("Add Source", self.add_source),
+            ("Add Overlay", self.add_overlay),
+            ("Transcribe (STT)", self.transcribe_selected),
+            ("Export", self.export),
+            ("Batch Export...", self.batch_export_dialog),
+            ("Preview", self.preview),
+        ), padx=4)
 
-        main_pane = tk.PanedWindow(self, orient="horizontal")
-        main_pane.pack(fill="both", expand=True, padx=8, pady=6)
+    @staticmethod
+    def _button_row(parent, buttons, padx=2):
+        # ttk buttons share the theme engine and are cheaper to create than classic tk.Button
+        for text, command in buttons:
+            ttk.Button(parent, text=text, command=command).pack(side="left", padx=padx)
 
+    def _build_left(self, main_pane):
         left_frame = tk.Frame(main_pane)
         main_pane.add(left_frame, width=380)
-        right_frame = tk.Frame(main_pane)
-        main_pane.add(right_frame)
 
         # Left column: sources/overlays/plugins
         tk.Label(left_frame, text="Sources", font=("Segoe UI", 10, "bold")).pack(anchor="w")
-        self.lst_sources = tk.Listbox(left_frame, width=60, height=8)
+        self.lst_sources = VirtualList(left_frame, heading="Path", height=8)
         self.lst_sources.pack(padx=4, pady=4)
         src_buttons = tk.Frame(left_frame)
         src_buttons.pack(fill="x", padx=4)
-        tk.Button(src_buttons, text="Remove", command=self.remove_selected_source).pack(side="left", padx=2)
+        self._button_row(src_buttons, (
+            ("Remove", self.remove_selected_source),
+            ("Up", lambda: self.move_item(self.lst_sources, self._sources_model, -1)),
+            ("Down", lambda: self.move_item(self.lst_sources, self._sources_model, 1)),
+        ))
 
         tk.Label(left_frame, text="Overlays", font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(12,0))
-        self.lst_overlays = tk.Listbox(left_frame, width=60, height=7)
+        self.lst_overlays = VirtualList(left_frame, heading="Path", height=7)
         self.lst_overlays.pack(padx=4, pady=4)
-        tk.Button(left_frame, text="Remove Overlay", command=self.remove_selected_overlay).pack(padx=4)
+        ov_buttons = tk.Frame(left_frame)
+        ov_buttons.pack(fill="x", padx=4)
+        self._button_row(ov_buttons, (
+            ("Remove Overlay", self.remove_selected_overlay),
+            ("Up", lambda: self.move_item(self.lst_overlays, self._overlays_model, -1)),
+            ("Down", lambda: self.move_item(self.lst_overlays, self._overlays_model, 1)),
+        ))
+
+    def _build_right(self, main_pane):
+        right_frame = tk.Frame(main_pane)
+        main_pane.add(right_frame)
 
         # Right: effects and transcript / log
         eff_frame = tk.LabelFrame(right_frame, text="Effects & Export", padx=8, pady=8)
         eff_frame.pack(fill="x", padx=8, pady=(0,8))
 
-        self.chk_stutter = tk.IntVar(value=1 if self.adaptor.effects.get("stutter") else 0)
+        # initial values mirror the adaptor defaults; _install_adaptor syncs them once it exists
+        self.chk_stutter = tk.IntVar(value=0)
         tk.Checkbutton(eff_frame, text="Stutter", variable=self.chk_stutter, command=self.update_effects).grid(row=0, column=0, sticky="w")
         tk.Label(eff_frame, text="ms").grid(row=0, column=2, sticky="w")
-        self.ent_stutter_ms = tk.Spinbox(eff_frame, from_=20, to=2000, increment=10, width=6, command=self.update_effects)
-        self.ent_stutter_ms.delete(0, "end")
-        self.ent_stutter_ms.insert(0, str(self.adaptor.effects.get("stutter_ms", 120)))
+        self.var_stutter_ms = tk.IntVar(value=120)
+        self.ent_stutter_ms = tk.Spinbox(eff_frame, from_=20, to=2000, increment=10, width=6, textvariable=self.var_stutter_ms)
+        self.var_stutter_ms.trace_add("write", self._schedule_update_effects)
         self.ent_stutter_ms.grid(row=0, column=1, sticky="w", padx=(6,12))
 
-        self.chk_scramble = tk.IntVar(value=1 if self.adaptor.effects.get("scramble") else 0)
+        self.chk_scramble = tk.IntVar(value=0)
         tk.Checkbutton(eff_frame, text="Scramble", variable=self.chk_scramble, command=self.update_effects).grid(row=1, column=0, sticky="w")
         tk.Label(eff_frame, text="Segments").grid(row=1, column=2, sticky="w")
-        self.ent_scramble_segments = tk.Spinbox(eff_frame, from_=2, to=64, width=6, command=self.update_effects)
-        self.ent_scramble_segments.delete(0, "end")
-        self.ent_scramble_segments.insert(0, str(self.adaptor.effects.get("scramble_segments", 8)))
+        self.var_scramble_segments = tk.IntVar(value=8)
+        self.ent_scramble_segments = tk.Spinbox(eff_frame, from_=2, to=64, width=6, textvariable=self.var_scramble_segments)
+        self.var_scramble_segments.trace_add("write", self._schedule_update_effects)
         self.ent_scramble_segments.grid(row=1, column=1, sticky="w", padx=(6,12))
 
-        self.chk_reverse = tk.IntVar(value=1 if self.adaptor.effects.get("reverse") else 0)
+        self.chk_reverse = tk.IntVar(value=0)
         tk.Checkbutton(eff_frame, text="Reverse", variable=self.chk_reverse, command=self.update_effects).grid(row=2, column=0, sticky="w")
 
         tk.Label(eff_frame, text="Pitch (semitones)").grid(row=3, column=0, sticky="w", pady=(8,0))
-        self.sld_pitch = tk.Scale(eff_frame, from_=-12, to=12, orient="horizontal", length=260, command=self.update_pitch)
-        self.sld_pitch.set(self.adaptor.effects.get("pitch_semitones", 0.0))
+        self.sld_pitch = tk.Scale(eff_frame, from_=-12, to=12, orient="horizontal", length=260,
+                                 command=lambda val: self._throttle("pitch", 50, self.update_pitch, val))
+        self.sld_pitch.set(0.0)
         self.sld_pitch.grid(row=4, column=0, columnspan=3, sticky="w")
 
+        tk.Label(eff_frame, text="Preset").grid(row=5, column=0, sticky="w", pady=(8,0))
+        self.cmb_preset = ttk.Combobox(eff_frame, state="readonly", width=28)
+        self.cmb_preset.grid(row=5, column=1, columnspan=2, sticky="w", pady=(8,0))
+        self.cmb_preset.bind("<<ComboboxSelected>>", lambda e: self.preset_selected())
+        if self.presets:
+            self._apply_presets(self.presets)
+
         # Chroma key
         chroma_frame = tk.LabelFrame(right_frame, text="Chroma Key (Green Screen)", padx=8, pady=8)
         chroma_frame.pack(fill="x", padx=8, pady=(0,8))
         self.chk_chroma = tk.IntVar(value=0)
         tk.Checkbutton(chroma_frame, text="Enable Chroma Key", variable=self.chk_chroma, command=self.update_chroma).grid(row=0, column=0, sticky="w")
         tk.Label(chroma_frame, text="Similarity").grid(row=0, column=1, sticky="w")
-        self.sld_chroma_sim = tk.Scale(chroma_frame, from_=0.01, to=0.8, resolution=0.01, orient="horizontal", length=220)
+        self.sld_chroma_sim = tk.Scale(chroma_frame, from_=0.01, to=0.8, resolution=0.01, orient="horizontal", length=220,
+                                       command=lambda _val: self._throttle("chroma", 50, self.update_chroma))
         self.sld_chroma_sim.set(0.2)
         self.sld_chroma_sim.grid(row=0, column=2, padx=6)
         tk.Label(chroma_frame, text="Blend").grid(row=1, column=1, sticky="w")
-        self.sld_chroma_blend = tk.Scale(chroma_frame, from_=0, to=1.0, resolution=0.01, orient="horizontal", length=220)
+        self.sld_chroma_blend = tk.Scale(chroma_frame, from_=0, to=1.0, resolution=0.01, orient="horizontal", length=220,
+                                         command=lambda _val: self._throttle("chroma", 50, self.update_chroma))
         self.sld_chroma_blend.set(0.1)
         self.sld_chroma_blend.grid(row=1, column=2, padx=6)
 
@@ -183,106 +538,172 @@ class FreePoopApp(tk.Tk):
         self.sld_shuffle.set(0.45)
         self.sld_shuffle.pack(side="left", padx=8)
 
+    def _build_log(self):
         # Bottom log and batch jobs
         bottom = tk.LabelFrame(self, text="Log / Batch Jobs", padx=8, pady=8)
         bottom.pack(fill="both", padx=8, pady=(0,8), expand=False)
         self.txt_log = tk.Text(bottom, height=10)
         self.txt_log.pack(fill="both", expand=True)
 
-        # initial plugin refresh
-        self.refresh_plugins()
-
     # ---------------- Project ----------------
+    def _bind_models(self):
+        """
+        The list widgets mirror the adaptor's own source/overlay lists; keep direct
+        references so edits mutate them in place instead of rebuilding Path lists.
+        Call again whenever the adaptor replaces those lists.
+        """
+        self._sources_model = self.adaptor.sources
+        self._overlays_model = self.adaptor.overlays
+
     def new_project(self):
-        self.adaptor = YTPFFmpegAdaptor()
+        self.adaptor = _get_adaptor_cls()()
+        self._bind_models()
         self.lst_sources.delete(0, "end")
         self.lst_overlays.delete(0, "end")
         self.txt_log.delete("1.0", "end")
         self.log("New project created.")
 
+    @_needs_adaptor
     def save_project(self):
         if not self.adaptor.sources and not self.adaptor.overlays:
             messagebox.showwarning("Empty project", "No sources or overlays to save.")
             return
-        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("FreePoop project", "*.json")])
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=_PROJECT_FILETYPES)
         if not path:
             return
         data = self.adaptor.export_project_state()
-        with open(path, "w", encoding="utf-8") as fh:
-            json.dump(data, fh, indent=2)
+        # json.dump always streams through the pure-Python encoder; only a one-shot dumps
+        # without indent= takes the C encoder, so big projects are serialised compactly in one go
+        if len(data.get("sources", [])) + len(data.get("overlays", [])) > _PROJECT_COMPACT_ITEMS:
+            text = json.dumps(data, separators=(",", ":"))
+        else:
+            text = json.dumps(data, indent=2)
+        if path.lower().endswith(".gz"):
+            fh = gzip.open(path, "wt", compresslevel=1, encoding="utf-8")
+        else:
+            fh = open(path, "w", encoding="utf-8")
+        with fh:
+            fh.write(text)
         self.log(f"Project saved: {path}")
 
+    @_needs_adaptor
     def load_project(self):
-        path = filedialog.askopenfilename(title="Open project", filetypes=[("FreePoop project", "*.json")])
+        path = filedialog.askopenfilename(title="Open project", filetypes=_PROJECT_FILETYPES)
         if not path:
             return
-        with open(path, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        with open(path, "rb") as fh:
+            raw = fh.read()
+        if raw[:2] == b"\x1f\x8b":  # gzip magic, whatever the extension
+            raw = gzip.decompress(raw)
+        data = json.loads(raw)
         self.adaptor.load_project_state(data)
-        # refresh UI lists
+        self._bind_models()
+        self._refresh_lists()
+        self.log(f"Project loaded: {path}")
+
+    def _refresh_lists(self):
+        """Re-render both list widgets from the model; one insert (and one re-render) per list."""
         self.lst_sources.delete(0, "end")
-        for s in self.adaptor.sources:
-            self.lst_sources.insert("end", str(s))
+        self.lst_sources.insert("end", *(str(s) for s in self._sources_model))
         self.lst_overlays.delete(0, "end")
-        for ov in self.adaptor.overlays:
-            self.lst_overlays.insert("end", str(ov.get("path")))
-        self.log(f"Project loaded: {path}")
+        self.lst_overlays.insert("end", *(str(ov.get("path")) for ov in self._overlays_model))
 
     # ---------------- Sources / Overlays ----------------
+    @_needs_adaptor
     def add_source(self):
-        fn = filedialog.askopenfilename(title="Select source video/audio")
+        fn = filedialog.askopenfilename(title="Select source video/audio", initialdir=self._last_media_dir)
         if not fn:
             return
         try:
             p = self.adaptor.add_source(fn)
             self.lst_sources.insert("end", str(p))
             self.log(f"Added source: {p}")
+            self._remember_media_dir(p)
         except Exception as e:
             messagebox.showerror("Add source error", str(e))
             self.log("Add source error: " + str(e))
 
+    def _remember_media_dir(self, path):
+        """
+        Open the next file dialog in this folder and pre-warm the OS directory cache
+        with a background scandir, so the dialog lists it quickly (network drives).
+        """
+        folder = str(Path(path).parent)
+        self._last_media_dir = folder
+        def warm():
+            try:
+                with os.scandir(folder) as it:
+                    for _ in it:
+                        pass
+            except OSError:
+                pass
+        threading.Thread(target=warm, daemon=True).start()
+
     def remove_selected_source(self):
         sel = self.lst_sources.curselection()
         if not sel:
             return
         idx = sel[0]
         p = self.lst_sources.get(idx)
+        # rows and model entries share indices, so the row index is the lookup key
+        # (path keys would break on duplicate sources and after reordering)
+        if idx >= len(self._sources_model) or str(self._sources_model[idx]) != p:
+            self.log("Source list was out of sync with the project; refreshed it (nothing removed).")
+            self._refresh_lists()
+            return
         self.lst_sources.delete(idx)
-        self.adaptor.sources = [s for s in self.adaptor.sources if str(s) != p]
+        self._sources_model.pop(idx)
         self.log(f"Removed source: {p}")
 
+    def move_item(self, lst, model, delta: int):
+        """Move the selected row (and its model entry) up/down; the first source is the main input."""
+        sel = lst.curselection()
+        if not sel:
+            return
+        idx = sel[0]
+        new_idx = idx + delta
+        if not 0 <= new_idx < len(model):
+            return
+        model.insert(new_idx, model.pop(idx))
+        text = lst.get(idx)
+        lst.delete(idx)
+        lst.insert(new_idx, text)
+        lst.selection_set(new_idx)
+
+    @_needs_adaptor
     def add_overlay(self):
-        fn = filedialog.askopenfilename(title="Select overlay (image/gif/video)")
+        fn = filedialog.askopenfilename(title="Select overlay (image/gif/video)", initialdir=self._last_media_dir)
         if not fn:
             return
         # If GIF, offer loop/fps dialog
         if fn.lower().endswith(".gif"):
-            dlg = tk.Toplevel(self)
-            dlg.title("GIF Overlay Options")
-            tk.Label(dlg, text="Loop count (0=infinite, 1=single)").pack(padx=8, pady=6)
-            spin_loop = tk.Spinbox(dlg, from_=0, to=10, width=6)
-            spin_loop.delete(0, "end"); spin_loop.insert(0, "0"); spin_loop.pack(padx=8)
-            tk.Label(dlg, text="FPS (output)").pack(padx=8, pady=(6,0))
-            spin_fps = tk.Spinbox(dlg, from_=6, to=60, width=6)
-            spin_fps.delete(0, "end"); spin_fps.insert(0, "15"); spin_fps.pack(padx=8)
+            dlg, spin_loop, spin_fps, btn_ok = self._gif_dialog()
+            spin_loop.delete(0, "end"); spin_loop.insert(0, "0")
+            spin_fps.delete(0, "end"); spin_fps.insert(0, "15")
             def on_ok():
                 loop = int(spin_loop.get())
                 fps = int(spin_fps.get())
+                dlg.withdraw()
+                # ffmpeg reads the GIF directly during export, so there is nothing to convert up front
                 try:
-                    conv = self.adaptor.prepare_overlay_from_gif(fn, loop=loop, fps=fps)
-                    self.adaptor.add_overlay(str(conv))
-                    self.lst_overlays.insert("end", f"{conv} (converted gif)")
-                    self.log(f"Added overlay (converted gif): {conv}")
+                    ov = self.adaptor.add_overlay(fn, loop=loop, fps=fps)
                 except Exception as e:
-                    messagebox.showerror("GIF convert error", str(e))
-                    self.log("GIF convert error: " + str(e))
-                dlg.destroy()
-            tk.Button(dlg, text="OK", command=on_ok).pack(pady=8)
+                    messagebox.showerror("Add overlay error", str(e))
+                    self.log("Add overlay error: " + str(e))
+                    return
+                # label from the stored Path, not the dialog string, so the row matches the model
+                self.lst_overlays.insert("end", f"{ov['path']} (gif, loop={loop}, {fps} fps)")
+                self.log(f"Added overlay (gif): {ov['path']}")
+                self._remember_media_dir(ov["path"])
+            btn_ok.configure(command=on_ok)
+            dlg.deiconify()
+            dlg.lift()
             return
         try:
             ov = self.adaptor.add_overlay(fn)
             self.lst_overlays.insert("end", str(ov.get("path")))
             self.log(f"Added overlay: {fn}")
+            self._remember_media_dir(ov.get("path"))
         except Exception as e:
             messagebox.showerror("Add overlay error", str(e))
             self.log("Add overlay error: " + str(e))
@@ -293,69 +714,130 @@ class FreePoopApp(tk.Tk):
             return
         idx = sel[0]
         p = self.lst_overlays.get(idx)
+        # index lookup also covers "(gif, ...)" rows, whose text never matched the path
+        if idx >= len(self._overlays_model) or not p.startswith(str(self._overlays_model[idx].get("path"))):
+            self.log("Overlay list was out of sync with the project; refreshed it (nothing removed).")
+            self._refresh_lists()
+            return
         self.lst_overlays.delete(idx)
-        self.adaptor.overlays = [o for o in self.adaptor.overlays if str(o.get("path")) != p]
+        self._overlays_model.pop(idx)
         self.log(f"Removed overlay: {p}")
 
     # ---------------- Plugins ----------------
+    @_needs_adaptor
     def refresh_plugins(self):
         if self.adaptor.plugin_manager is None:
             self.log("No plugin manager available.")
             return
-        self.adaptor.plugin_manager.discover()
-        self.log("Plugins refreshed.")
+        pm = self.adaptor.plugin_manager
+        def scan():
+            # plugin imports can be slow; do them off the Tk thread and report via the ui queue
+            try:
+                reloaded = pm.discover_if_changed()
+                enabled = set(pm.list_enabled())
+                listing = ", ".join(f"{p} {'[ENABLED]' if p in enabled else '[disabled]'}" for p in pm.list_plugins())
+                self._ui_q.put(("log", ("Plugins refreshed" if reloaded else "Plugins unchanged") + (f": {listing}" if listing else ".")))
+            except Exception as e:
+                self._ui_q.put(("log", "Plugin refresh error: " + str(e)))
+        threading.Thread(target=scan, daemon=True).start()
 
     # ---------------- Effects ----------------
+    def _schedule_update_effects(self, *_trace_args):
+        # spinbox variables are written on every arrow step or keystroke; apply once they settle
+        self._debounce("effects", 50, self.update_effects)
+
     def update_effects(self):
+        if self.adaptor is None:
+            return  # applied by _install_adaptor
         try:
-            st_ms = int(self.ent_stutter_ms.get())
+            st_ms = int(self.var_stutter_ms.get())
         except Exception:
             st_ms = 120
         try:
-            scr_seg = int(self.ent_scramble_segments.get())
+            scr_seg = int(self.var_scramble_segments.get())
         except Exception:
             scr_seg = 8
-        self.adaptor.set_effect("stutter", bool(self.chk_stutter.get()))
-        self.adaptor.set_effect("stutter_ms", st_ms)
-        self.adaptor.set_effect("stutter_repeats", int(self.adaptor.effects.get("stutter_repeats", 6)))
-        self.adaptor.set_effect("scramble", bool(self.chk_scramble.get()))
-        self.adaptor.set_effect("scramble_segments", scr_seg)
-        self.adaptor.set_effect("reverse", bool(self.chk_reverse.get()))
-        # chroma
-        self.adaptor.set_effect("chroma_enabled", bool(self.chk_chroma.get()))
-        self.adaptor.set_effect("chroma_similarity", float(self.sld_chroma_sim.get()))
-        self.adaptor.set_effect("chroma_blend", float(self.sld_chroma_blend.get()))
-        self.log("Effects updated.")
+        desired = {
+            "stutter": bool(self.chk_stutter.get()),
+            "stutter_ms": st_ms,
+            "stutter_repeats": int(self.adaptor.effects.get("stutter_repeats", 6)),
+            "scramble": bool(self.chk_scramble.get()),
+            "scramble_segments": scr_seg,
+            "reverse": bool(self.chk_reverse.get()),
+            # chroma
+            "chroma_enabled": bool(self.chk_chroma.get()),
+            "chroma_similarity": float(self.sld_chroma_sim.get()),
+            "chroma_blend": float(self.sld_chroma_blend.get()),
+        }
+        current = self.adaptor.effects
+        changed = {k: v for k, v in desired.items() if current.get(k) != v}
+        if not changed:
+            return
+        self.adaptor.set_effects(changed)
+        self.log("Effects changed: " + ", ".join(changed))
 
     def update_pitch(self, val):
+        if self.adaptor is None:
+            return  # applied by _install_adaptor
         v = float(val)
         self.adaptor.set_effect("pitch_semitones", v)
         self.log(f"Pitch set to {v}")
 
     def update_chroma(self):
-        self.update_effects()
+        # only the chroma keys; no need to re-read every spinbox via update_effects
+        if self.adaptor is None:
+            return  # applied by _install_adaptor
+        self.adaptor.set_effects({
+            "chroma_enabled": bool(self.chk_chroma.get()),
+            "chroma_similarity": float(self.sld_chroma_sim.get()),
+            "chroma_blend": float(self.sld_chroma_blend.get()),
+        })
+        self.log("Chroma key updated.")
 
     # ---------------- Transcription / Poopify ----------------
+    @_needs_adaptor
     def transcribe_selected(self):
         if not self.adaptor.sources:
             messagebox.showwarning("No source", "Please add a source to transcribe.")
             return
-        if stt_mod is None or not hasattr(stt_mod, "transcribe_file"):
-            messagebox.showinfo("STT not available", "STT backend not installed. Install faster-whisper/whisper or speech_recognition.")
-            return
         src = str(self.adaptor.sources[0])
-        def do_transcribe():
-            self.log("Transcribing...")
+        # unchanged files are served from the on-disk transcript cache
+        try:
+            cache_path = _transcript_cache_path(Path(src))
+        except OSError:
+            cache_path = None
+        if cache_path is not None and cache_path.exists():
             try:
-                txt = stt_mod.transcribe_file(src)
+                txt = cache_path.read_text(encoding="utf-8")
                 self.txt_original.delete("1.0", "end")
                 self.txt_original.insert("1.0", txt)
-                self.log("Transcription complete.")
+                self.log("Transcript loaded from cache.")
+                return
+            except Exception as e:
+                self.log("Transcript cache read error: " + str(e))
+        async def do_transcribe():
+            # first use imports the STT stack, which can take seconds; keep it off the Tk thread
+            stt_mod = await asyncio.to_thread(_optional_import, "speech_to_text")
+            if stt_mod is None or not hasattr(stt_mod, "transcribe_file"):
+                self._ui_q.put(("dialog", "info", "STT not available", "STT backend not installed. Install faster-whisper/whisper or speech_recognition."))
+                return
+            self._ui_q.put(("log", "Transcribing..."))
+            try:
+                txt = await asyncio.to_thread(stt_mod.transcribe_file, src)
+                self._ui_q.put(("set_text", self.txt_original, txt))
+                self._ui_q.put(("log", "Transcription complete."))
+                if cache_path is not None:
+                    try:
+                        cache_path.parent.mkdir(parents=True, exist_ok=True)
+                        cache_path.write_text(txt, encoding="utf-8")
+                    except OSError as e:
+                        self._ui_q.put(("log", "Transcript cache write error: " + str(e)))
             except Exception as e:
-                self.log("STT error: " + str(e))
-                messagebox.showerror("STT error", str(e))
-        threading.Thread(target=do_transcribe, daemon=True).start()
+                self._ui_q.put(("log", "STT error: " + str(e)))
+                self._ui_q.put(("dialog", "error", "STT error", str(e)))
+        self._run_job(do_transcribe())
 
+    @_needs_adaptor
     def poopify_transcript(self):
         src_txt = self.txt_original.get("1.0", "end").strip()
         if not src_txt:
@@ -371,20 +853,20 @@ class FreePoopApp(tk.Tk):
         self.log("Poopified transcript stored in project state.")
 
     def simple_pooper(self, text, intensity=0.5):
-        import random
-        random.seed(int(time.time()) & 0xFFFF)
         words = text.split()
         n = len(words)
         if n <= 1:
             return text
         swaps = max(1, int(n * intensity * 0.5))
-        for _ in range(swaps):
-            i = random.randrange(n)
-            j = random.randrange(n)
-            words[i], words[j] = words[j], words[i]
+        # partial Fisher-Yates: draw all distinct positions in one C call, then swap pairs
+        idx = self._rng.sample(range(n), min(2 * swaps, n))
+        for i in range(0, len(idx) - 1, 2):
+            a, b = idx[i], idx[i + 1]
+            words[a], words[b] = words[b], words[a]
         return " ".join(words)
 
     # ---------------- Export / Batch ----------------
+    @_needs_adaptor
     def preview(self):
         try:
             self.adaptor.preview()
@@ -393,6 +875,7 @@ class FreePoopApp(tk.Tk):
             self.log("Preview error: " + str(e))
             messagebox.showerror("Preview error", str(e))
 
+    @_needs_adaptor
     def export(self):
         if not self.adaptor.sources:
             messagebox.showwarning("No source", "Add a source before exporting.")
@@ -403,15 +886,32 @@ class FreePoopApp(tk.Tk):
         # update effects
         self.update_effects()
         # allow vocoder plugin usage (plugin logic handled in adaptor/plugin manager)
-        def run_export(outp):
-            self.log(f"Export started: {outp}")
-            proc = self.adaptor.export(outp)
-            if proc.returncode == 0:
-                self.log(f"Export succeeded: {outp}")
+        async def run_export(outp):
+            self._ui_q.put(("log", f"Export started: {outp}"))
+            try:
+                res = await asyncio.to_thread(self.adaptor.export_with_progress, outp, self._export_progress_logger())
+            except Exception as e:
+                self._ui_q.put(("log", f"Export failed: {outp}\n{e}"))
+                return
+            if res.returncode == 0:
+                self._ui_q.put(("log", f"Export succeeded: {outp}"))
             else:
-                self.log(f"Export failed: {outp}\n{proc.stderr}")
-        threading.Thread(target=run_export, args=(out,), daemon=True).start()
+                tail = "\n".join(res.stderr.strip().splitlines()[-20:])
+                self._ui_q.put(("log", f"Export failed: {outp} (exit code {res.returncode})\n{tail}"))
+        self._run_job(run_export(out))
 
+    def _export_progress_logger(self, every_s: float = 2.0):
+        # ffmpeg reports roughly twice a second; keep the log to one line per interval
+        last = [0.0]
+        def on_progress(report):
+            now = time.monotonic()
+            if report.get("progress") != "end" and now - last[0] < every_s:
+                return
+            last[0] = now
+            self._ui_q.put(("log", f"Export progress: {report.get('out_time', '?')} (speed {report.get('speed', '?')})"))
+        return on_progress
+
+    @_needs_adaptor
     def batch_export_dialog(self):
         if not self.adaptor.sources:
             messagebox.showwarning("No source", "Add at least one source before batch exporting.")
@@ -419,39 +919,162 @@ class FreePoopApp(tk.Tk):
         folder = filedialog.askdirectory(title="Select output folder for batch exports")
         if not folder:
             return
-        dlg = tk.Toplevel(self)
-        dlg.title("Batch export settings")
-        tk.Label(dlg, text="Number of outputs").pack(padx=8, pady=6)
-        spin = tk.Spinbox(dlg, from_=1, to=64, width=6); spin.delete(0, "end"); spin.insert(0, "3"); spin.pack(padx=8)
+        dlg, spin, btn_start = self._batch_dialog()
+        spin.delete(0, "end"); spin.insert(0, "3")
         def on_ok():
             n = int(spin.get())
+            self.update_effects()
             for i in range(n):
                 outp = Path(folder) / f"freepoop_batch_{i+1}.mp4"
-                import random
                 pitch = (i - n//2) * 0.5
-                self.adaptor.set_effect("pitch_semitones", pitch)
-                t = threading.Thread(target=self._batch_export_run, args=(str(outp),), daemon=True)
-                t.start()
-            dlg.destroy()
-        tk.Button(dlg, text="Start", command=on_ok).pack(pady=8)
-
-    def _batch_export_run(self, outp):
-        self.log(f"Batch job started: {outp}")
-        proc = self.adaptor.export(outp)
+                self._batch_pool.submit(self._batch_export_run, str(outp), pitch)
+            dlg.withdraw()
+        btn_start.configure(command=on_ok)
+        dlg.deiconify()
+        dlg.lift()
+
+    # Dialogs are built once and withdrawn between uses; re-creating a Toplevel
+    # and its children on every open is far slower than deiconify().
+    def _gif_dialog(self):
+        if self._gif_dlg is None:
+            dlg = tk.Toplevel(self)
+            dlg.title("GIF Overlay Options")
+            tk.Label(dlg, text="Loop count (0=infinite, 1=single)").pack(padx=8, pady=6)
+            spin_loop = tk.Spinbox(dlg, from_=0, to=10, width=6)
+            spin_loop.pack(padx=8)
+            tk.Label(dlg, text="FPS (output)").pack(padx=8, pady=(6,0))
+            spin_fps = tk.Spinbox(dlg, from_=6, to=60, width=6)
+            spin_fps.pack(padx=8)
+            btn_ok = tk.Button(dlg, text="OK")
+            btn_ok.pack(pady=8)
+            dlg.protocol("WM_DELETE_WINDOW", dlg.withdraw)
+            self._gif_dlg = (dlg, spin_loop, spin_fps, btn_ok)
+        return self._gif_dlg
+
+    def _batch_dialog(self):
+        if self._batch_dlg is None:
+            dlg = tk.Toplevel(self)
+            dlg.title("Batch export settings")
+            tk.Label(dlg, text="Number of outputs").pack(padx=8, pady=6)
+            spin = tk.Spinbox(dlg, from_=1, to=64, width=6)
+            spin.pack(padx=8)
+            btn_start = tk.Button(dlg, text="Start")
+            btn_start.pack(pady=8)
+            dlg.protocol("WM_DELETE_WINDOW", dlg.withdraw)
+            self._batch_dlg = (dlg, spin, btn_start)
+        return self._batch_dlg
+
+    def _batch_export_run(self, outp, pitch):
+        self._ui_q.put(("log", f"Batch job started: {outp}"))
+        # jobs run concurrently, so each gets its own effects snapshot rather than
+        # racing on set_effect("pitch_semitones") in the shared adaptor
+        try:
+            # concurrent jobs split the cores rather than each ffmpeg claiming all of them
+            threads = max(1, (os.cpu_count() or 1) // self._batch_workers)
+            proc = self.adaptor.with_effects({"pitch_semitones": pitch}).export(outp, threads=threads)
+        except Exception as e:
+            # pool futures are never inspected, so report here or the error is lost
+            self._ui_q.put(("log", f"Batch job failed: {outp}\n{e}"))
+            return
         if proc.returncode == 0:
-            self.log(f"Batch job finished: {outp}")
+            self._ui_q.put(("log", f"Batch job finished: {outp}"))
         else:
-            self.log(f"Batch job failed: {outp}\n{proc.stderr}")
+            self._ui_q.put(("log", f"Batch job failed: {outp}\n{proc.stderr}"))
 
     # ---------------- Utilities ----------------
+    def _debounce(self, key, delay_ms: int, fn, *args):
+        """Call fn(*args) once no further call with the same key arrived for delay_ms."""
+        pending = self._debounce_ids.pop(key, None)
+        if pending is not None:
+            self.after_cancel(pending)
+        def fire():
+            self._debounce_ids.pop(key, None)
+            fn(*args)
+        self._debounce_ids[key] = self.after(delay_ms, fire)
+
+    def _throttle(self, key, delay_ms: int, fn, *args):
+        """
+        Call fn with the latest args at most once per delay_ms for this key.
+        Used for sliders, whose command fires on every pixel of a drag.
+        """
+        pending = key in self._throttled
+        self._throttled[key] = (fn, args)
+        if pending:
+            return
+        def fire():
+            fn_, args_ = self._throttled.pop(key)
+            fn_(*args_)
+        self.after(delay_ms, fire)
+
+    def _run_job(self, coro):
+        """Schedule a coroutine on the background job loop; safe to call from the Tk thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _drain_ui_queue(self):
+        """
+        Apply everything worker threads have posted to self._ui_q, then reschedule.
+        Messages: ("log", text), ("dialog", kind, title, text), ("set_text", widget, text),
+        ("presets", presets), ("adaptor", adaptor).
+        """
+        while True:
+            try:
+                msg = self._ui_q.get_nowait()
+            except queue.Empty:
+                break
+            kind = msg[0]
+            try:
+                if kind == "log":
+                    self.log(msg[1])
+                elif kind == "dialog":
+                    _, level, title, text = msg
+                    if level == "error":
+                        messagebox.showerror(title, text)
+                    elif level == "warning":
+                        messagebox.showwarning(title, text)
+                    else:
+                        messagebox.showinfo(title, text)
+                elif kind == "set_text":
+                    _, widget, text = msg
+                    widget.delete("1.0", "end")
+                    widget.insert("1.0", text)
+                elif kind == "presets":
+                    self._apply_presets(msg[1])
+                elif kind == "adaptor":
+                    self._install_adaptor(msg[1])
+            except Exception as e:
+                print(f"[FreePoopApp] ui queue error ({kind}): {e}", file=sys.stderr)
+        self.after(50, self._drain_ui_queue)
+
     def log(self, text: str):
+        """Append a line to the log; may be called from any thread."""
+        if threading.get_ident() != self._tk_thread:
+            # Tk is not thread-safe: hand the line to the Tk thread
+            self._ui_q.put(("log", text))
+            return
         ts = time.strftime("%H:%M:%S")
+        self._log_buf.append(f"[{ts}] {text}\n")
+        if not self._log_scheduled:
+            # everything logged until Tk goes idle lands in a single insert
+            self._log_scheduled = True
+            self.after_idle(self._flush_log)
+
+    def _flush_log(self):
+        self._log_scheduled = False
+        if not self._log_buf:
+            return
+        blob = "".join(self._log_buf)
+        self._log_buf.clear()
         try:
-            self.txt_log.insert("end", f"[{ts}] {text}\n")
+            self.txt_log.insert("end", blob)
+            lines = int(self.txt_log.index("end-1c").split(".")[0])
+            if lines > LOG_MAX_LINES:
+                # drop the oldest lines in one chunk rather than one per insert
+                drop = lines - LOG_MAX_LINES + LOG_TRIM_LINES
+                self.txt_log.delete("1.0", f"{drop + 1}.0")
             self.txt_log.see("end")
         except Exception:
             # if log widget not yet ready, print to stderr
-            print(f"[{ts}] {text}", file=sys.stderr)
+            print(blob, end="", file=sys.stderr)
 
 if __name__ == "__main__":
     app = FreePoopApp()
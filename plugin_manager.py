@@ -14,15 +14,50 @@ Simple Plugin Manager for FreePoop V2
         ...
     def run(adaptor, **kwargs) -> Any:  # optional
         ...
+- PLUGIN_NAME / PLUGIN_DESC are read as plain string literals from the top of the
+  file at discovery time; the module itself is only imported once the plugin is
+  enabled or run.
 - Enabled plugins are tracked in a .plugins.json file in cwd by default.
 """
 from __future__ import annotations
 import importlib.util
-import json
+import os
+import re
 import sys
 from pathlib import Path
 from types import ModuleType
-from typing import Dict, Optional, List, Any
+from typing import Callable, Dict, Optional, List, Any, Tuple
+
+try:
+    import orjson  # faster config round-trips; stdlib json is the fallback
+    _loads = orjson.loads
+    _dumps = lambda o: orjson.dumps(o, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+    _loads = json.loads
+    _dumps = lambda o: json.dumps(o, indent=2).encode("utf-8")
+
+
+DEFAULT_PLUGINS_DIR = Path(__file__).resolve().parent / "plugins"
+_META_SCAN_BYTES = 4096  # metadata is expected near the top of the plugin file
+# stat memo shared by every PluginManager in the process; None marks a miss
+_stat_cache: Dict[str, Optional[os.stat_result]] = {}
+
+
+def _cached_exists(path) -> bool:
+    key = str(path)
+    st = _stat_cache.get(key)
+    if st is None:
+        # misses are re-checked so a config written later is still found
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            st = None
+        _stat_cache[key] = st
+    return st is not None
+
+
+_META_RE = re.compile(rb"""^(PLUGIN_NAME|PLUGIN_DESC)\s*(?::[^=\n]*)?=\s*(['"])(.*?)\2""", re.M)
 
 
 class PluginLoadError(Exception):
@@ -37,6 +72,23 @@ class Plugin:
         self.meta: Dict[str, Any] = {}
         self.available: bool = False
 
+    def load_metadata(self):
+        """Read PLUGIN_NAME / PLUGIN_DESC from the file head without importing it."""
+        with open(self.path, "rb") as fh:
+            head = fh.read(_META_SCAN_BYTES)
+        for m in _META_RE.finditer(head):
+            value = m.group(3).decode("utf-8", "replace")
+            if m.group(1) == b"PLUGIN_NAME":
+                self.name = value
+            else:
+                self.meta["desc"] = value
+        self.meta.setdefault("desc", "")
+
+    def ensure_loaded(self):
+        if not self.available:
+            self.load()
+        return self.module
+
     def load(self):
         spec = importlib.util.spec_from_file_location(f"freepoop_plugins.{self.path.stem}", str(self.path))
         if spec is None:
@@ -47,9 +99,8 @@ class Plugin:
             raise PluginLoadError(f"No loader for plugin {self.path}")
         loader.exec_module(mod)  # type: ignore
         self.module = mod
-        # determine canonical name
-        self.name = getattr(mod, "PLUGIN_NAME", self.path.stem)
-        self.meta["desc"] = getattr(mod, "PLUGIN_DESC", "")
+        # the name is fixed at discovery (it keys the manager's tables); only refresh the description
+        self.meta["desc"] = getattr(mod, "PLUGIN_DESC", self.meta.get("desc", ""))
         self.available = True
 
     def call_hook(self, hook_name: str, *args, **kwargs):
@@ -64,18 +115,21 @@ class Plugin:
 class PluginManager:
     def __init__(self, adaptor=None, plugins_dir: Optional[str] = None, config_path: Optional[str] = None):
         self.adaptor = adaptor
-        self.root = Path(plugins_dir or (Path(__file__).parent / "plugins"))
+        self.root = Path(plugins_dir) if plugins_dir else DEFAULT_PLUGINS_DIR
         self.root.mkdir(parents=True, exist_ok=True)
         self.config_path = Path(config_path or Path.cwd() / ".plugins.json")
         self.plugins: Dict[str, Plugin] = {}
         self.enabled: Dict[str, bool] = {}
+        self._scan_key: Optional[tuple] = None  # directory fingerprint of the last discover()
+        # hook name -> [(plugin name, bound hook)] for enabled plugins; filled per hook on first use
+        self._hook_index: Dict[str, List[Tuple[str, Callable]]] = {}
         self._load_config()
         self.discover()
 
     def _load_config(self):
-        if self.config_path.exists():
+        if _cached_exists(self.config_path):
             try:
-                data = json.loads(self.config_path.read_text(encoding="utf-8"))
+                data = _loads(self.config_path.read_bytes())
                 self.enabled = data.get("enabled", {})
             except Exception:
                 self.enabled = {}
@@ -84,26 +138,69 @@ class PluginManager:
 
     def _save_config(self):
         try:
-            self.config_path.write_text(json.dumps({"enabled": self.enabled}, indent=2), encoding="utf-8")
+            self.config_path.write_bytes(_dumps({"enabled": self.enabled}))
         except Exception:
             pass
 
+    def _scan_entries(self) -> List[os.DirEntry]:
+        # one scandir pass; DirEntry.is_file() reuses the readdir type instead of a stat per match
+        with os.scandir(self.root) as it:
+            entries = [e for e in it if e.name.endswith(".py") and e.is_file(follow_symlinks=False)]
+        entries.sort(key=lambda e: e.name)
+        return entries
+
+    def _fingerprint(self, entries: Optional[List[os.DirEntry]] = None) -> tuple:
+        # directory mtime catches added/removed files, per-file mtimes catch edits
+        if entries is None:
+            entries = self._scan_entries()
+        files = tuple((e.name, e.stat(follow_symlinks=False).st_mtime_ns) for e in entries)
+        return (self.root.stat().st_mtime_ns, files)
+
+    def discover_if_changed(self) -> bool:
+        """
+        Re-run discover() only when the plugins directory changed since the last scan.
+        Returns True if plugins were reloaded.
+        """
+        try:
+            key = self._fingerprint()
+        except OSError:
+            key = None
+        if key is not None and key == self._scan_key:
+            return False
+        self.discover()
+        return True
+
     def discover(self):
         """
-        Scan the plugins directory for .py files and load metadata.
+        Scan the plugins directory for .py files and read their metadata.
+        Modules are not imported here; see Plugin.ensure_loaded().
         """
-        self.plugins = {}
-        for p in sorted(self.root.glob("*.py")):
+        try:
+            entries = self._scan_entries()
+        except OSError as e:
+            print(f"[plugin_manager] could not scan {self.root}: {e}", file=sys.stderr)
+            entries = []
+        try:
+            self._scan_key = self._fingerprint(entries)
+        except OSError:
+            self._scan_key = None
+        # build into a fresh dict and swap at the end so readers on other threads
+        # never see a half-populated plugin table
+        plugins: Dict[str, Plugin] = {}
+        for entry in entries:
+            p = Path(entry.path)
             try:
                 plugin = Plugin(p)
-                plugin.load()
-                self.plugins[plugin.name] = plugin
+                plugin.load_metadata()
+                plugins[plugin.name] = plugin
                 # ensure enabled map has key (default disabled)
                 if plugin.name not in self.enabled:
                     self.enabled[plugin.name] = False
             except Exception as e:
                 # ignore failing plugin file but keep scanning
-                print(f"[plugin_manager] failed to load plugin {p}: {e}", file=sys.stderr)
+                print(f"[plugin_manager] failed to read plugin {p}: {e}", file=sys.stderr)
+        self.plugins = plugins
+        self._hook_index = {}
 
     def list_plugins(self) -> List[str]:
         return list(self.plugins.keys())
@@ -114,16 +211,24 @@ class PluginManager:
             raise KeyError("Plugin not found: " + name)
         return {"name": p.name, "desc": p.meta.get("desc", ""), "available": p.available, "enabled": self.enabled.get(p.name, False)}
 
+    def list_enabled(self) -> List[str]:
+        return [name for name in self.plugins if self.enabled.get(name, False)]
+
     def is_enabled(self, name: str) -> bool:
         return bool(self.enabled.get(name, False))
 
     def enable(self, name: str):
         if name not in self.plugins:
             raise KeyError("Plugin not found: " + name)
+        plugin = self.plugins[name]
+        try:
+            plugin.ensure_loaded()
+        except Exception as e:
+            raise PluginLoadError(f"Could not load plugin {name}: {e}") from e
         self.enabled[name] = True
         self._save_config()
+        self._hook_index = {}
         # call initialize hook if present
-        plugin = self.plugins[name]
         try:
             plugin.call_hook("initialize", self.adaptor)
         except Exception as e:
@@ -134,6 +239,7 @@ class PluginManager:
             raise KeyError("Plugin not found: " + name)
         self.enabled[name] = False
         self._save_config()
+        self._hook_index = {}
         try:
             self.plugins[name].call_hook("on_disable", self.adaptor)
         except Exception:
@@ -148,16 +254,42 @@ class PluginManager:
         if not self.is_enabled(name):
             raise RuntimeError("Plugin not enabled: " + name)
         plugin = self.plugins[name]
+        plugin.ensure_loaded()
         return plugin.call_hook("run", self.adaptor, **kwargs)
 
+    def _hooks_for(self, hook_name: str) -> List[Tuple[str, Callable]]:
+        hooks = self._hook_index.get(hook_name)
+        if hooks is None:
+            hooks = []
+            for name, plugin in self.plugins.items():
+                if not self.is_enabled(name):
+                    continue
+                try:
+                    mod = plugin.ensure_loaded()
+                except Exception as e:
+                    print(f"[plugin_manager] failed to load plugin {name}: {e}", file=sys.stderr)
+                    continue
+                fn = getattr(mod, hook_name, None)
+                if callable(fn):
+                    hooks.append((name, fn))
+            self._hook_index[hook_name] = hooks
+        return hooks
+
+    def has_hook(self, hook_name: str) -> bool:
+        """True if any enabled plugin implements hook_name (lets callers skip building hook args)."""
+        return bool(self._hooks_for(hook_name))
+
     def run_hook_all(self, hook_name: str, *args, **kwargs):
         """
         Run a named hook on all enabled plugins (e.g., 'on_before_export'), in discovery order.
         """
-        for name, plugin in self.plugins.items():
-            if not self.is_enabled(name):
-                continue
+        # one try around the loop; after a failing plugin the same iterator resumes with the next one
+        hooks = iter(self._hooks_for(hook_name))
+        name = None
+        while True:
             try:
-                plugin.call_hook(hook_name, *args, **kwargs)
+                for name, fn in hooks:
+                    fn(*args, **kwargs)
+                return
             except Exception as e:
                 print(f"[plugin_manager] plugin {name} hook {hook_name} error: {e}", file=sys.stderr)
\ No newline at end of file
@@ -1,102 +1,155 @@
 # speech_to_text.py (Deluxe)
 # Uses faster-whisper (preferred) -> whisper -> SpeechRecognition (pocketsphinx/google) fallback.
 from __future__ import annotations
-import os, tempfile, subprocess
+import os, subprocess, tempfile
+import functools
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
-
-# try faster-whisper
-_HAS_FAST_WHISPER = False
-try:
-    from faster_whisper import WhisperModel
-    _HAS_FAST_WHISPER = True
-except Exception:
-    _HAS_FAST_WHISPER = False
-
-# try openai/whisper
-_HAS_WHISPER = False
-try:
-    import whisper
-    _HAS_WHISPER = True
-except Exception:
-    _HAS_WHISPER = False
-
-# speech_recognition fallback
-_HAS_SR = False
-try:
-    import speech_recognition as sr
-    _HAS_SR = True
-except Exception:
-    _HAS_SR = False
-
-# pocketsphinx availability
-_HAS_POCKETS = False
-if _HAS_SR:
-    try:
-        import pocketsphinx  # type: ignore
-        _HAS_POCKETS = True
-    except Exception:
-        _HAS_POCKETS = False
-
-def _ensure_wav(in_path: str, out_wav: str, ffmpeg_bin: str = "ffmpeg"):
-    cmd = [ffmpeg_bin, "-y", "-i", str(in_path), "-ar", "16000", "-ac", "1", "-vn", "-f", "wav", str(out_wav)]
-    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+from typing import Any, List, Dict, Optional
+
+# Backends are imported on first use: whisper pulls in torch, which can take seconds,
+# and importing this module shouldn't pay that for callers that never transcribe.
+_UNSET = object()
+_backends: Dict[str, Any] = {}
+
+def _backend(name: str):
+    """Import an optional STT backend once; None if it isn't installed or fails to import."""
+    mod = _backends.get(name, _UNSET)
+    if mod is _UNSET:
+        try:
+            mod = importlib.import_module(name)
+        except Exception:
+            mod = None
+        _backends[name] = mod
+    return mod
+
+_PCM_RATE = 16000
+
+def _decode_pcm(in_path: str, ffmpeg_bin: str = "ffmpeg") -> bytes:
+    """Decode to 16 kHz mono s16le PCM on ffmpeg's stdout (no temp WAV on disk)."""
+    cmd = [ffmpeg_bin, "-v", "error", "-i", str(in_path), "-ar", str(_PCM_RATE), "-ac", "1", "-vn", "-f", "s16le", "-"]
+    p = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if p.returncode != 0:
-        raise RuntimeError("ffmpeg convert failed: " + p.stderr)
+        raise RuntimeError("ffmpeg convert failed: " + p.stderr.decode("utf-8", "replace"))
+    return p.stdout
+
+def _decode_pcm_batch(paths: List[str], ffmpeg_bin: str = "ffmpeg", chunk: int = 32) -> Dict[str, bytes]:
+    """
+    Decode many files to PCM with one ffmpeg process per chunk (N inputs, N outputs)
+    instead of one process per file. A chunk that fails is left out of the result so
+    the caller's per-file decode can report which file was bad.
+    """
+    pcm: Dict[str, bytes] = {}
+    with tempfile.TemporaryDirectory(prefix="freepoop_stt_") as tmp:
+        for start in range(0, len(paths), chunk):
+            group = paths[start:start + chunk]
+            cmd = [ffmpeg_bin, "-v", "error", "-y"]
+            for p in group:
+                cmd += ["-i", str(p)]
+            outs = []
+            for i in range(len(group)):
+                out = os.path.join(tmp, f"{start + i}.pcm")
+                cmd += ["-map", f"{i}:a:0", "-ar", str(_PCM_RATE), "-ac", "1", "-f", "s16le", out]
+                outs.append(out)
+            r = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if r.returncode != 0:
+                continue
+            for p, out in zip(group, outs):
+                with open(out, "rb") as fh:
+                    pcm[p] = fh.read()
+    return pcm
+
+# whisper models are not safe to share across threads; decoding runs outside this lock
+_model_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=4)
+def _get_fast_whisper(model: str, device: str, compute_type: str):
+    # loading weights dominates short clips, so keep one instance per configuration
+    return _backend("faster_whisper").WhisperModel(model, device=device, compute_type=compute_type)
 
-def transcribe_file(path: str, model: str = "small", device: str = "cpu", ffmpeg_bin: str = "ffmpeg") -> str:
+@functools.lru_cache(maxsize=4)
+def _get_whisper(model: str):
+    return _backend("whisper").load_model(model)
+
+def transcribe_file(path: str, model: str = "small", device: str = "cpu", ffmpeg_bin: str = "ffmpeg",
+                    compute_type: str = "float32", _model=None, _pcm: Optional[bytes] = None) -> str:
+    """
+    compute_type is passed to faster-whisper; "int8" (CPU) or "float16" (GPU) are
+    faster but quantized, so they are opt-in.
+    """
     src = Path(path)
     if not src.exists():
         raise FileNotFoundError("File not found: " + path)
 
     # faster-whisper branch
-    if _HAS_FAST_WHISPER:
+    fw_mod = _backend("faster_whisper")
+    if fw_mod is not None:
         try:
             # streaming decode with faster-whisper is efficient
-            m = WhisperModel(model, device=device, compute_type="float32")
-            segments, info = m.transcribe(str(src))
-            text = " ".join([s.text for s in segments])
+            m = _model or _get_fast_whisper(model, device, compute_type)
+            audio = fw_mod.decode_audio(str(src))
+            with _model_lock:
+                # segments is lazy; inference happens while joining
+                segments, info = m.transcribe(audio)
+                text = " ".join([s.text for s in segments])
             return text.strip()
         except Exception as e:
             print(f"[stt] faster-whisper error, falling back: {e}")
 
-    if _HAS_WHISPER:
+    if _backend("whisper") is not None:
         try:
-            m = whisper.load_model(model)
-            res = m.transcribe(str(src))
+            with _model_lock:
+                m = _get_whisper(model)
+                res = m.transcribe(str(src))
             return res.get("text", "").strip()
         except Exception as e:
             print(f"[stt] whisper error, falling back: {e}")
 
     # speech_recognition fallback
-    if _HAS_SR:
+    sr = _backend("speech_recognition")
+    if sr is not None:
         r = sr.Recognizer()
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp_wav = tmp.name
-        try:
-            _ensure_wav(str(src), tmp_wav, ffmpeg_bin=ffmpeg_bin)
-            with sr.AudioFile(tmp_wav) as af:
-                audio = r.record(af)
-            if _HAS_POCKETS:
-                try:
-                    return r.recognize_sphinx(audio).strip()
-                except Exception as e:
-                    print(f"[stt] pocketsphinx error: {e}")
+        pcm = _pcm if _pcm is not None else _decode_pcm(str(src), ffmpeg_bin=ffmpeg_bin)
+        audio = sr.AudioData(pcm, _PCM_RATE, 2)
+        if _backend("pocketsphinx") is not None:
             try:
-                return r.recognize_google(audio).strip()
+                return r.recognize_sphinx(audio).strip()
             except Exception as e:
-                raise RuntimeError("SpeechRecognition (Google) failed: " + str(e))
-        finally:
-            try: os.unlink(tmp_wav)
-            except Exception: pass
+                print(f"[stt] pocketsphinx error: {e}")
+        try:
+            return r.recognize_google(audio).strip()
+        except Exception as e:
+            raise RuntimeError("SpeechRecognition (Google) failed: " + str(e))
 
     raise RuntimeError("No STT backend available. Install faster-whisper/whisper or speech_recognition (+pocketsphinx).")
 
-def transcribe_batch(paths: List[str], model: str = "small", device: str = "cpu") -> Dict[str,str]:
-    results = {}
-    for p in paths:
+def transcribe_batch(paths: List[str], model: str = "small", device: str = "cpu", max_workers: Optional[int] = None,
+                     ffmpeg_bin: str = "ffmpeg", compute_type: str = "float32") -> Dict[str,str]:
+    """
+    Transcribe several files concurrently. Audio decoding and the SpeechRecognition
+    fallback run in parallel; whisper inference is serialized on one shared model.
+    compute_type is as for transcribe_file.
+    """
+    fw = None
+    if _backend("faster_whisper") is not None:
         try:
-            results[p] = transcribe_file(p, model=model, device=device)
+            fw = _get_fast_whisper(model, device, compute_type)
         except Exception as e:
-            results[p] = f"ERROR: {e}"
-    return results
\ No newline at end of file
+            print(f"[stt] faster-whisper model load failed, falling back: {e}")
+    pcm: Dict[str, bytes] = {}
+    if fw is None and _backend("whisper") is None and _backend("speech_recognition") is not None:
+        # SpeechRecognition needs raw PCM for every file; decode them in as few ffmpeg runs as possible
+        pcm = _decode_pcm_batch([p for p in paths if Path(p).exists()], ffmpeg_bin=ffmpeg_bin)
+
+    def one(p: str) -> str:
+        try:
+            return transcribe_file(p, model=model, device=device, ffmpeg_bin=ffmpeg_bin, compute_type=compute_type,
+                                   _model=fw, _pcm=pcm.get(p))
+        except Exception as e:
+            return f"ERROR: {e}"
+
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(one, paths)))
\ No newline at end of file
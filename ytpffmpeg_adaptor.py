@@ -2,47 +2,194 @@
 # Adds: project save/load, chroma key filter option, batch export support, improved GIF conversion with loop/fps,
 # plugin vocoder hook support.
 from __future__ import annotations
+import asyncio
 import os
+import shutil
 import subprocess
 import tempfile
+import threading
 import uuid
 import math
-from typing import List, Dict, Optional, Tuple, Any
+import copy
+import functools
+import itertools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Any
 from pathlib import Path
 import random
+import re
 import json
 
-try:
-    import yt_dlp
-except Exception:
-    yt_dlp = None
-
 try:
     from plugin_manager import PluginManager
 except Exception:
     PluginManager = None
 
+def _find_download(path: Path, exts: Tuple[str, ...] = ("mp4", "mkv", "webm", "avi")) -> Optional[Path]:
+    """Locate a yt-dlp output with one scandir of its directory instead of a stat per extension."""
+    try:
+        with os.scandir(path.parent) as it:
+            names = {e.name for e in it}
+    except FileNotFoundError:
+        return None
+    for cand in (path.name, *(path.stem + "." + ext for ext in exts)):
+        if cand in names:
+            return path.with_name(cand)
+    return None
+
+@functools.lru_cache(maxsize=128)
+def _pitch_chain(semitones: float, sample_rate: int) -> str:
+    """asetrate/aresample/atempo chain for a pitch shift (semitones pre-rounded by the caller)."""
+    rate_factor = 2 ** (semitones / 12.0)
+    tempo = 1.0 / rate_factor
+    chain = [f"asetrate={int(sample_rate*rate_factor)}", f"aresample={sample_rate}"]
+    # atempo accepts [0.5, 2.0]; k equal factors of tempo**(1/k) always land inside it
+    k = max(1, math.ceil(abs(math.log2(tempo)) - 1e-12))
+    step = tempo ** (1.0 / k)
+    if abs(step - 1.0) > 1e-9:
+        chain += [f"atempo={step:.8f}"] * k
+    return ",".join(chain)
+
+# overlay x/y expressions mentioning these change per frame and need the default eval=frame
+_PER_FRAME_VARS = re.compile(r"\b(t|n|pos)\b")
+
+# transcript -> subtitle cues: one cue per sentence or line
+_SENT_RE = re.compile(r"[.\n\r]+")
+
+def parse_progress(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """
+    Group ffmpeg "-progress" key=value lines into one dict per report.
+    Each report ends with a progress=continue|end line.
+    """
+    block: Dict[str, str] = {}
+    for line in lines:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        block[key] = value.strip()
+        if key == "progress":
+            yield block
+            block = {}
+
 def _safe_run(cmd: List[str], cwd: Optional[str] = None) -> subprocess.CompletedProcess:
     return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, cwd=cwd)
 
-def ffprobe_duration(path: Path, ffprobe_bin: str = "ffprobe") -> float:
-    cmd = [ffprobe_bin, "-v", "error", "-show_entries", "format=duration",
-           "-of", "default=noprint_wrappers=1:nokey=1", str(path)]
+class _LabelGen:
+    """Short unique filtergraph pad labels: a..z, then a1..z1, a2.. (keeps big graphs compact)."""
+    _LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+    def __init__(self):
+        self._n = 0
+
+    def mark(self) -> int:
+        return self._n
+
+    def seek(self, n: int):
+        self._n = n
+
+    def __call__(self) -> str:
+        n = self._n
+        self._n += 1
+        head = self._LETTERS[n % 26]
+        n //= 26
+        if not n:
+            return head
+        digits = []
+        while n:
+            n, r = divmod(n, 36)
+            digits.append("0123456789abcdefghijklmnopqrstuvwxyz"[r])
+        return head + "".join(reversed(digits))
+
+_FILTER_SCRIPT_MIN_CHARS = 8192  # well below Linux's 128 KiB single-argument limit
+# containers that carry H.264/AAC as-is, so an untouched source can be remuxed into them
+_COPY_CONTAINERS = (".mp4", ".m4v", ".mov", ".mkv")
+
+def _filter_arg(value: str) -> str:
+    """Escape a filter option value (e.g. a Windows path with its drive colon) for use inside a filtergraph."""
+    value = re.sub(r"([\\':])", r"\\\1", value)  # option-level escaping
+    return re.sub(r"([\\'\[\],;])", r"\\\1", value)  # filtergraph-level escaping
+
+_HW_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_videotoolbox")
+
+@functools.lru_cache(maxsize=4)
+def _detect_hw_encoder(ffmpeg_bin: str = "ffmpeg") -> str:
+    """First H.264 hardware encoder ffmpeg lists and can actually open here, else libx264."""
+    try:
+        listed = _safe_run([ffmpeg_bin, "-hide_banner", "-encoders"]).stdout
+    except OSError:
+        return "libx264"
+    for enc in _HW_ENCODERS:
+        if f" {enc} " not in listed:
+            continue
+        # static builds list nvenc/qsv even without the hardware, so try a one-frame encode
+        test = [ffmpeg_bin, "-hide_banner", "-v", "error", "-f", "lavfi", "-i", "color=s=256x256:d=0.1",
+                "-frames:v", "1", "-c:v", enc, "-f", "null", "-"]
+        try:
+            if subprocess.run(test, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15).returncode == 0:
+                return enc
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+    return "libx264"
+
+def _video_codec_args(encoder: str, crf: int, preset: str) -> List[str]:
+    # map the libx264 crf/preset knobs onto each encoder's closest equivalent
+    if encoder == "h264_nvenc":
+        return ["-c:v", encoder, "-pix_fmt", "yuv420p", "-preset", "p4", "-rc", "vbr", "-cq", str(crf), "-b:v", "0"]
+    if encoder == "h264_qsv":
+        return ["-c:v", encoder, "-pix_fmt", "nv12", "-preset", preset, "-global_quality", str(crf)]
+    if encoder == "h264_videotoolbox":
+        return ["-c:v", encoder, "-pix_fmt", "yuv420p", "-q:v", str(max(1, min(100, 100 - 2 * crf)))]
+    return ["-c:v", encoder, "-preset", preset, "-crf", str(crf)]
+
+def _run_captured(cmd: List[str], running: Optional[set] = None) -> subprocess.CompletedProcess:
+    """
+    Like _safe_run, but stdout/stderr land in unnamed temp files rather than pipes, so a
+    long ffmpeg run never stalls on a full pipe buffer. Keep _safe_run for short ffprobe calls.
+    The process is kept in `running` while it runs, so it can be killed from another thread.
+    """
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=out, stderr=err)
+        if running is not None:
+            running.add(proc)
+        try:
+            rc = proc.wait()
+        finally:
+            if running is not None:
+                running.discard(proc)
+        out.seek(0); err.seek(0)
+        return subprocess.CompletedProcess(cmd, rc, out.read().decode("utf-8", "replace"), err.read().decode("utf-8", "replace"))
+
+def ffprobe_info(path: Path, ffprobe_bin: str = "ffprobe") -> Dict[str, Any]:
+    """Format and stream metadata for one file from a single ffprobe run ({'format': ..., 'streams': [...]})."""
+    cmd = [ffprobe_bin, "-threads", "0", "-v", "error", "-show_format", "-show_streams",
+           "-of", "json", str(path)]
     p = _safe_run(cmd)
     if p.returncode != 0:
         raise RuntimeError(f"ffprobe error: {p.stderr.strip()}")
     try:
-        return float(p.stdout.strip())
+        return json.loads(p.stdout)
+    except Exception as e:
+        raise RuntimeError(f"Could not parse ffprobe output: {e}")
+
+def _info_duration(info: Dict[str, Any]) -> float:
+    try:
+        return float(info["format"]["duration"])
     except Exception as e:
         raise RuntimeError(f"Could not parse duration: {e}")
 
+def ffprobe_duration(path: Path, ffprobe_bin: str = "ffprobe") -> float:
+    return _info_duration(ffprobe_info(path, ffprobe_bin))
+
 class YTPFFmpegAdaptor:
-    def __init__(self, ffmpeg_bin: str = "ffmpeg", ffplay_bin: str = "ffplay", ffprobe_bin: str = "ffprobe", temp_dir: Optional[str] = None):
+    def __init__(self, ffmpeg_bin: str = "ffmpeg", ffplay_bin: str = "ffplay", ffprobe_bin: str = "ffprobe", temp_dir: Optional[str] = None,
+                 auto_threads: bool = True):
         self.ffmpeg = ffmpeg_bin
         self.ffplay = ffplay_bin
         self.ffprobe = ffprobe_bin
         self.temp_dir = Path(temp_dir or tempfile.mkdtemp(prefix="freepoop_"))
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        # pass an explicit encoder thread count; turn off on single-core/embedded boxes
+        self.auto_threads = auto_threads
         self.sources: List[Path] = []
         self.overlays: List[Dict] = []
         self.effects: Dict[str, Any] = {
@@ -53,43 +200,99 @@ class YTPFFmpegAdaptor:
         self.preset_params: Dict[str, Any] = {}
         self.plugin_manager = PluginManager(self) if PluginManager else None
         self._seed = random.getrandbits(32)
+        # path -> (st_mtime_ns, st_size, ffprobe_info); shared with with_effects() copies
+        self._probe_cache: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+        # built stutter/scramble subgraphs, see _cached_fragment; also shared with with_effects() copies
+        self._fragment_cache: Dict[Tuple, Tuple[List[str], str, str, int]] = {}
+        # built on the first URL; YoutubeDL setup (extractors, cookies) is too slow to repeat per download
+        self._ydl = None
+        self._ydl_lock = threading.Lock()
+        self._preview_proc: Optional[subprocess.Popen] = None
+        # ffmpeg exports in flight, see terminate_exports; shared with with_effects() copies
+        self._running: set = set()
+
+    # ---------- effects ----------
+    def set_effect(self, name: str, value: Any):
+        self.effects[name] = value
+
+    def set_effects(self, values: Dict[str, Any]):
+        """Apply several effect values in one call (what the GUI does on every change)."""
+        self.effects.update(values)
+
+    def with_effects(self, overrides: Optional[Dict[str, Any]] = None) -> "YTPFFmpegAdaptor":
+        """
+        Shallow copy that shares sources, overlays, temp dir and plugins but owns its
+        effects/preset_params dicts, so concurrent jobs can export different settings.
+        """
+        job = copy.copy(self)
+        job.effects = dict(self.effects)
+        if overrides:
+            job.effects.update(overrides)
+        job.preset_params = dict(self.preset_params)
+        return job
 
     # ---------- sources & overlays ----------
     def add_source(self, path_or_url: str) -> Path:
         if path_or_url is None:
             raise ValueError("No path provided")
         if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
-            if yt_dlp is None:
-                raise RuntimeError("yt-dlp not installed")
-            opts = {"outtmpl": str(self.temp_dir / "%(id)s.%(ext)s"), "quiet": True, "no_warnings": True}
-            with yt_dlp.YoutubeDL(opts) as ydl:
+            with self._ydl_lock:
+                if self._ydl is None:
+                    # imported here so adaptor (and plugin) startup doesn't pay for yt-dlp's extractor tables
+                    try:
+                        import yt_dlp
+                    except ImportError:
+                        raise RuntimeError("yt-dlp not installed")
+                    opts = {"outtmpl": str(self.temp_dir / "%(id)s.%(ext)s"), "quiet": True, "no_warnings": True}
+                    self._ydl = yt_dlp.YoutubeDL(opts)
+                ydl = self._ydl
                 info = ydl.extract_info(path_or_url, download=True)
-                filename = ydl.prepare_filename(info)
-                p = Path(filename)
-                if not p.exists():
-                    for ext in ("mp4", "mkv", "webm", "avi"):
-                        c = p.with_suffix("." + ext)
-                        if c.exists():
-                            p = c; break
-                if not p.exists():
+                # yt-dlp reports the final (post-merge/remux) path; only scan for it if that is missing
+                downloads = info.get("requested_downloads") or [{}]
+                filepath = downloads[-1].get("filepath")
+                if filepath and Path(filepath).exists():
+                    p = Path(filepath)
+                else:
+                    p = _find_download(Path(ydl.prepare_filename(info)))
+                if p is None:
                     raise RuntimeError("Download succeeded but file not found")
                 self.sources.append(p)
+                self._fragment_cache.clear()
                 return p
         else:
             p = Path(path_or_url)
             if not p.exists():
                 raise FileNotFoundError("Source not found: " + path_or_url)
             self.sources.append(p)
+            self._fragment_cache.clear()
             return p
 
-    def add_overlay(self, file_path: str, x: str="(main_w-overlay_w)/2", y: str="(main_h-overlay_h)/2", start: float=0.0, duration: Optional[float]=None) -> Dict:
+    def add_overlay(self, file_path: str, x: str="(main_w-overlay_w)/2", y: str="(main_h-overlay_h)/2", start: float=0.0, duration: Optional[float]=None,
+                    loop: Optional[int] = None, fps: Optional[int] = None) -> Dict:
+        """
+        loop/fps are for animated inputs such as GIFs, which ffmpeg decodes straight into the
+        export graph: loop 0 repeats for the whole output, N plays N times; fps resamples the overlay.
+        """
         p = Path(file_path)
         if not p.exists():
             raise FileNotFoundError("Overlay not found: " + file_path)
         ov = {"path": p, "x": x, "y": y, "start": float(start), "duration": duration}
+        if loop is not None:
+            ov["loop"] = int(loop)
+        if fps:
+            ov["fps"] = int(fps)
         self.overlays.append(ov)
         return ov
 
+    @staticmethod
+    def _overlay_input_args(ov: Dict) -> List[str]:
+        loop = ov.get("loop")
+        if loop == 0:
+            return ["-ignore_loop", "0"]  # follow the GIF's own (normally infinite) loop flag
+        if loop and loop > 1:
+            return ["-stream_loop", str(loop - 1)]
+        return []
+
     def prepare_overlay_from_gif(self, gif_path: str, loop: int = 0, fps: int = 15) -> Path:
         gif = Path(gif_path)
         if not gif.exists():
@@ -104,7 +307,7 @@ class YTPFFmpegAdaptor:
             "-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "18",
             str(out_name)
         ]
-        p = _safe_run(cmd)
+        p = _run_captured(cmd)
         if p.returncode != 0:
             raise RuntimeError(f"GIF conversion failed: {p.stderr}")
         return out_name
@@ -114,31 +317,102 @@ class YTPFFmpegAdaptor:
         # Represent sources and overlays as simple strings
         return {
             "sources": [str(s) for s in self.sources],
-            "overlays": [{"path": str(o["path"]), "x": o.get("x"), "y": o.get("y"), "start": o.get("start"), "duration": o.get("duration")} for o in self.overlays],
+            "overlays": [{"path": str(o["path"]), "x": o.get("x"), "y": o.get("y"), "start": o.get("start"), "duration": o.get("duration"),
+                          "loop": o.get("loop"), "fps": o.get("fps")} for o in self.overlays],
             "effects": self.effects,
             "preset_params": self.preset_params
         }
 
     def load_project_state(self, data: Dict):
+        self._fragment_cache.clear()
         self.sources = [Path(p) for p in data.get("sources", [])]
         self.overlays = []
         for o in data.get("overlays", []):
-            self.overlays.append({"path": Path(o["path"]), "x": o.get("x"), "y": o.get("y"), "start": o.get("start", 0.0), "duration": o.get("duration")})
+            ov = {"path": Path(o["path"]), "x": o.get("x"), "y": o.get("y"), "start": o.get("start", 0.0), "duration": o.get("duration")}
+            ov.update((k, o[k]) for k in ("loop", "fps") if o.get(k) is not None)
+            self.overlays.append(ov)
         self.effects.update(data.get("effects", {}))
         self.preset_params.update(data.get("preset_params", {}))
 
+    def _probe_all(self, path: Path) -> Dict[str, Any]:
+        """ffprobe_info, memoized per file until its mtime or size changes; one ffprobe serves every lookup."""
+        path = Path(path)
+        st = path.stat()
+        hit = self._probe_cache.get(path)
+        if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+        info = ffprobe_info(path, self.ffprobe)
+        self._probe_cache[path] = (st.st_mtime_ns, st.st_size, info)
+        return info
+
+    def _get_duration(self, path: Path) -> float:
+        return _info_duration(self._probe_all(path))
+
+    def ffprobe_durations(self, paths: Iterable[Path]) -> Dict[Path, float]:
+        """
+        Durations for several files, probing the uncached ones concurrently and filling
+        _probe_cache in one go. Files that can't be probed are left out of the result.
+        """
+        paths = list(dict.fromkeys(Path(p) for p in paths))
+        def probe(path: Path) -> Optional[float]:
+            try:
+                return self._get_duration(path)
+            except Exception:
+                return None
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as pool:
+                durations = list(pool.map(probe, paths))
+        else:
+            durations = [probe(p) for p in paths]
+        return {p: d for p, d in zip(paths, durations) if d is not None}
+
+    def _stream_rates(self, path: Path) -> Tuple[float, int]:
+        """(video fps, audio sample rate) of the first streams, from the cached probe; 30/48000 when unknown."""
+        fps: Optional[float] = None
+        sr: Optional[int] = None
+        for st in self._probe_all(path).get("streams", []):
+            try:
+                if st.get("codec_type") == "video" and fps is None:
+                    num, _, den = str(st["r_frame_rate"]).partition("/")
+                    if float(num) > 0 and float(den or 1) > 0:
+                        fps = float(num) / float(den or 1)
+                elif st.get("codec_type") == "audio" and sr is None:
+                    sr = int(st["sample_rate"]) or None
+            except (KeyError, ValueError):
+                continue
+        return fps or 30.0, sr or 48000
+
+    def _cached_fragment(self, kind: str, key: Tuple, lbl: "_LabelGen", build) -> Tuple[List[str], str, str]:
+        """
+        Memoize a (fragments, out_v, out_a) builder result. The label generator position is part
+        of the key and is restored on a hit, so cached graphs splice in with consistent labels;
+        batch jobs that only differ elsewhere reuse these subgraphs.
+        """
+        ck = (kind, lbl.mark()) + key
+        hit = self._fragment_cache.get(ck)
+        if hit is None:
+            if len(self._fragment_cache) >= 256:
+                self._fragment_cache.clear()
+            frag, out_v, out_a = build()
+            hit = self._fragment_cache[ck] = (frag, out_v, out_a, lbl.mark())
+        else:
+            lbl.seek(hit[3])
+        return hit[0], hit[1], hit[2]
+
     # ---------- filter builders ----------
-    def _build_chroma_filter(self, in_label: str, out_label: str) -> str:
+    # builders return lists of complete filter chains; _assemble_filter_complex joins them once
+    def _build_chroma_filter(self, in_label: str, out_label: str) -> List[str]:
         # Basic chroma key using chromakey filter (many ffmpeg builds provide chromakey)
         sim = float(self.effects.get("chroma_similarity", 0.2))
         blend = float(self.effects.get("chroma_blend", 0.1))
         # target color green #00ff00; the chromakey filter expects color like 0x00FF00
-        return f"[{in_label}]chromakey=0x00FF00:{sim}:{blend}[{out_label}]"
+        return [f"[{in_label}]chromakey=0x00FF00:{sim}:{blend}[{out_label}]"]
 
     def _assemble_filter_complex(self) -> Tuple[str, str, str]:
         if not self.sources:
             raise RuntimeError("No sources")
-        parts = []
+        fragments: List[List[str]] = []
+        lbl = _LabelGen()
         # start labels referencing input streams (0:v,0:a)
         v_label = "0:v"
         a_label = "0:a"
@@ -147,64 +421,80 @@ class YTPFFmpegAdaptor:
 
         # Chroma key as first video operation if enabled
         if self.effects.get("chroma_enabled"):
-            ck_out = "v_chroma"
-            parts.append(self._build_chroma_filter(current_v, ck_out))
+            ck_out = lbl()
+            fragments.append(self._build_chroma_filter(current_v, ck_out))
             current_v = ck_out
 
         # reverse
         if self.effects.get("reverse"):
-            parts.append(f"[{current_v}]reverse[v_rev]")
-            parts.append(f"[{current_a}]areverse[a_rev]")
-            current_v = "v_rev"; current_a = "a_rev"
+            rev_v, rev_a = lbl(), lbl()
+            fragments.append([f"[{current_v}]reverse[{rev_v}]", f"[{current_a}]areverse[{rev_a}]"])
+            current_v = rev_v; current_a = rev_a
 
         # stutter and scramble use robust builders (imported from earlier)
         if self.effects.get("stutter"):
-            frag, out_v, out_a = self._build_stutter_filters(current_v, current_a,
-                                                             int(self.effects.get("stutter_ms", 120)),
-                                                             int(self.effects.get("stutter_repeats", 6)),
-                                                             self.sources[0])
-            parts.append(frag)
+            st_ms = int(self.effects.get("stutter_ms", 120))
+            st_rep = int(self.effects.get("stutter_repeats", 6))
+            src = self.sources[0]
+            fps, sr = self._stream_rates(src)
+            key = (current_v, current_a, st_ms, st_rep, src, self._get_duration(src), fps, sr)
+            frag, out_v, out_a = self._cached_fragment("stutter", key, lbl, lambda: self._build_stutter_filters(
+                current_v, current_a, st_ms, st_rep, src, fps=fps, sample_rate=sr, labels=lbl))
+            fragments.append(frag)
             current_v, current_a = out_v, out_a
 
         if self.effects.get("scramble"):
-            frag, out_v, out_a = self._build_scramble_filters(current_v, current_a,
-                                                              int(self.effects.get("scramble_segments", 8)),
-                                                              self.sources[0])
-            parts.append(frag)
+            segs = int(self.effects.get("scramble_segments", 8))
+            seed = self.effects.get("scramble_seed")
+            src = self.sources[0]
+            key = (current_v, current_a, segs, self._seed if seed is None else seed, src, self._get_duration(src))
+            frag, out_v, out_a = self._cached_fragment("scramble", key, lbl, lambda: self._build_scramble_filters(
+                current_v, current_a, segs, src, seed=seed, labels=lbl))
+            fragments.append(frag)
             current_v, current_a = out_v, out_a
 
         # pitch
         if abs(float(self.effects.get("pitch_semitones", 0.0))) > 1e-6:
-            pitch_frag = self._build_pitch_filter(current_a, f"{current_a}_p", float(self.effects.get("pitch_semitones", 0.0)))
-            parts.append(pitch_frag)
-            current_a = f"{current_a}_p"
+            pitch_out = lbl()
+            fragments.append(self._build_pitch_filter(current_a, pitch_out, float(self.effects.get("pitch_semitones", 0.0))))
+            current_a = pitch_out
 
         # overlays
-        overlay_chain = f"[{current_v}]"
+        overlay_parts = []
+        prev_v = current_v
         for idx, ov in enumerate(self.overlays, start=1):
-            ov_label = f"[{idx}:v]"
-            out_label = f"ov{idx}"
-            x = ov.get("x", "(main_w-overlay_w)/2")
-            y = ov.get("y", "(main_h-overlay_h)/2")
+            out_label = lbl()
+            x = ov.get("x") or "(main_w-overlay_w)/2"
+            y = ov.get("y") or "(main_h-overlay_h)/2"
+            # static positions are parsed once instead of re-evaluated on every frame
+            ev = "" if _PER_FRAME_VARS.search(f"{x} {y}") else ":eval=init"
             enable_expr = None
             if ov.get("start", 0) and ov.get("start") > 0:
                 end = ov["start"] + (ov.get("duration") if ov.get("duration") else 99999)
                 enable_expr = f"between(t,{ov['start']},{end})"
             enable = f":enable='{enable_expr}'" if enable_expr else ""
-            parts.append(f"{overlay_chain}{ov_label}overlay=x={x}:y={y}{enable}[{out_label}]")
-            overlay_chain = f"[{out_label}]"
+            src = f"{idx}:v"
+            if ov.get("fps"):
+                src_lbl = lbl()
+                overlay_parts.append(f"[{src}]fps={ov['fps']}[{src_lbl}]")
+                src = src_lbl
+            # an endlessly looping input must not keep the export running past the main video
+            shortest = ":shortest=1" if ov.get("loop") == 0 else ""
+            overlay_parts.append(f"[{prev_v}][{src}]overlay=x={x}:y={y}{ev}{shortest}{enable}[{out_label}]")
+            prev_v = out_label
 
-        final_v_label = overlay_chain.strip("[]") if overlay_chain.startswith("[") else overlay_chain
+        final_v_label = prev_v
         final_a_label = current_a
-        filter_complex = ";".join(parts) if parts else ""
+        fragments.append(overlay_parts)
+        filter_complex = ";".join(itertools.chain.from_iterable(fragments))
         return filter_complex, final_v_label, final_a_label
 
     # reuse robust builders from previous version (stutter/scramble/pitch)
-    def _build_stutter_filters(self, input_v_label: str, input_a_label: str, stutter_ms: int, repeats: int, source_path: Path) -> Tuple[str,str,str]:
+    def _build_stutter_filters(self, input_v_label: str, input_a_label: str, stutter_ms: int, repeats: int, source_path: Path,
+                               fps: float = 30, sample_rate: int = 48000, labels: Optional[_LabelGen] = None) -> Tuple[List[str],str,str]:
         # safe wrapper that calls previous implementation
-        from copy import deepcopy
         # replicate implementation inline for compatibility
-        D = ffprobe_duration(source_path, self.ffprobe)
+        D = self._get_duration(source_path)
         st_dur = min(max(stutter_ms / 1000.0, 0.02), D)
         default_start = min(1.0, max(0.0, D * 0.1))
         if default_start + st_dur > D:
@@ -218,182 +508,354 @@ class YTPFFmpegAdaptor:
         post_start = st_start + st_dur
         if post_start + 0.001 < D:
             segments.append(("post", post_start, D - post_start))
-        frag_parts = []
-        v_labels = []
-        a_labels = []
-        idx = 0
-        def vlbl(n): return f"vseg{n}"
-        def albl(n): return f"aseg{n}"
-        for name, start, dur in segments:
-            count = 1 if name != "st" else max(1, repeats)
-            for r in range(count):
-                frag_parts.append(f"[{input_v_label}]trim=start={start}:duration={dur},setpts=PTS-STARTPTS[{vlbl(idx)}]")
-                frag_parts.append(f"[{input_a_label}]atrim=start={start}:duration={dur},asetpts=PTS-STARTPTS[{albl(idx)}]")
-                v_labels.append(f"[{vlbl(idx)}]"); a_labels.append(f"[{albl(idx)}]")
-                idx += 1
-        n = len(v_labels)
-        interleaved = []
-        for i in range(n):
-            interleaved.append(v_labels[i]); interleaved.append(a_labels[i])
-        concat_block = "".join(interleaved) + f"concat=n={n}:v=1:a=1[st_v][st_a]"
-        frag = ";".join(frag_parts + [concat_block])
-        return frag, "st_v", "st_a"
-
-    def _build_scramble_filters(self, input_v_label: str, input_a_label: str, segments: int, source_path: Path) -> Tuple[str,str,str]:
-        D = ffprobe_duration(source_path, self.ffprobe)
+        n = len(segments)
+        lbl = labels or _LabelGen()
+        vsrc = [lbl() for _ in range(n)]
+        asrc = [lbl() for _ in range(n)]
+        vseg = [lbl() for _ in range(n)]
+        aseg = [lbl() for _ in range(n)]
+        out_v, out_a = lbl(), lbl()
+        # one branch per segment; the stutter fragment is decoded once and replayed by loop/aloop
+        # (fps/sample_rate size the replay buffers, so they must be the source's real rates)
+        frag_parts = [
+            f"[{input_v_label}]split={n}" + "".join(f"[{l}]" for l in vsrc),
+            f"[{input_a_label}]asplit={n}" + "".join(f"[{l}]" for l in asrc),
+        ]
+        for i, (name, start, dur) in enumerate(segments):
+            v_chain = f"[{vsrc[i]}]trim=start={start}:duration={dur},setpts=PTS-STARTPTS"
+            a_chain = f"[{asrc[i]}]atrim=start={start}:duration={dur},asetpts=PTS-STARTPTS"
+            if name == "st" and repeats > 1:
+                v_chain += f",loop=loop={repeats - 1}:size={min(32767, max(1, math.ceil(dur * fps)))}:start=0,setpts=N/FRAME_RATE/TB"
+                a_chain += f",aloop=loop={repeats - 1}:size={max(1, math.ceil(dur * sample_rate))}:start=0,asetpts=N/SR/TB"
+            frag_parts.append(f"{v_chain}[{vseg[i]}]")
+            frag_parts.append(f"{a_chain}[{aseg[i]}]")
+        frag_parts.append("".join(f"[{v}][{a}]" for v, a in zip(vseg, aseg)) + f"concat=n={n}:v=1:a=1[{out_v}][{out_a}]")
+        return frag_parts, out_v, out_a
+
+    def _build_scramble_filters(self, input_v_label: str, input_a_label: str, segments: int, source_path: Path,
+                                seed: Optional[int] = None, labels: Optional[_LabelGen] = None) -> Tuple[List[str],str,str]:
+        D = self._get_duration(source_path)
         segments = max(1, segments)
         seg_dur = max(0.01, D / segments)
-        frag_parts = []
-        v_labels = []
-        a_labels = []
+        lbl = labels or _LabelGen()
+        vs = [lbl() for _ in range(segments)]
+        as_ = [lbl() for _ in range(segments)]
+        out_v, out_a = lbl(), lbl()
+        # fan the upstream chain out once with split/asplit so it is traversed a single time
+        # (and so labels produced by earlier effects are not consumed more than once);
+        # select/aselect can only drop frames, not reorder them, so the trims stay.
+        frag_parts = [
+            f"[{input_v_label}]split={segments}" + "".join(f"[{l}]" for l in vs),
+            f"[{input_a_label}]asplit={segments}" + "".join(f"[{l}]" for l in as_),
+        ]
+        seg_out = []
         for i in range(segments):
             start = i * seg_dur
             dur = max(0.01, D - start) if i == segments - 1 else seg_dur
-            frag_parts.append(f"[{input_v_label}]trim=start={start}:duration={dur},setpts=PTS-STARTPTS[v_{i}]")
-            frag_parts.append(f"[{input_a_label}]atrim=start={start}:duration={dur},asetpts=PTS-STARTPTS[a_{i}]")
-            v_labels.append(f"[v_{i}]"); a_labels.append(f"[a_{i}]")
+            v_out, a_out = lbl(), lbl()
+            frag_parts.append(f"[{vs[i]}]trim=start={start}:duration={dur},setpts=PTS-STARTPTS[{v_out}]")
+            frag_parts.append(f"[{as_[i]}]atrim=start={start}:duration={dur},asetpts=PTS-STARTPTS[{a_out}]")
+            seg_out.append(f"[{v_out}][{a_out}]")
         order = list(range(segments))
-        rnd = random.Random(self._seed)
+        rnd = random.Random(self._seed if seed is None else seed)
         rnd.shuffle(order)
-        interleaved = []
-        for i in order:
-            interleaved.append(v_labels[i]); interleaved.append(a_labels[i])
-        concat_block = "".join(interleaved) + f"concat=n={segments}:v=1:a=1[scr_v][scr_a]"
-        frag = ";".join(frag_parts + [concat_block])
-        return frag, "scr_v", "scr_a"
-
-    def _build_pitch_filter(self, in_label: str, out_label: str, semitones: float, sample_rate: int = 44100) -> str:
+        frag_parts.append("".join(seg_out[i] for i in order) + f"concat=n={segments}:v=1:a=1[{out_v}][{out_a}]")
+        return frag_parts, out_v, out_a
+
+    def _build_pitch_filter(self, in_label: str, out_label: str, semitones: float, sample_rate: int = 44100) -> List[str]:
         if abs(semitones) < 1e-6:
-            return f"[{in_label}]anull[{out_label}]"
-        rate_factor = 2 ** (semitones / 12.0)
-        tempo = 1.0 / rate_factor
-        atempo_filters = []
-        remaining = tempo
-        while remaining < 0.5 or remaining > 2.0:
-            if remaining < 0.5:
-                atempo_filters.append(0.5); remaining /= 0.5
-            else:
-                atempo_filters.append(2.0); remaining /= 2.0
-        atempo_filters.append(remaining)
-        atempo_str = ",".join([f"atempo={f:.8f}" for f in atempo_filters if abs(f-1.0) > 1e-9])
-        filt = f"[{in_label}]asetrate={int(sample_rate*rate_factor)},aresample={sample_rate}"
-        if atempo_str:
-            filt += f",{atempo_str}"
-        filt += f"[{out_label}]"
-        return filt
+            return [f"[{in_label}]anull[{out_label}]"]
+        return [f"[{in_label}]{_pitch_chain(round(semitones, 3), int(sample_rate))}[{out_label}]"]
 
     # ---------- generate & export ----------
-    def generate_command(self, output_path: str, overwrite: bool=True, crf: int=18, preset: str="medium") -> List[str]:
+    def generate_command(self, output_path: str, overwrite: bool=True, crf: int=18, preset: str="medium",
+                         video_encoder: Optional[str] = None, hwaccel: bool = True, stream_copy: bool = True,
+                         threads: Optional[int] = None) -> List[str]:
+        """
+        video_encoder=None picks a working hardware H.264 encoder (nvenc/qsv/videotoolbox),
+        falling back to libx264; hwaccel lets ffmpeg decode the main source on the GPU.
+        With stream_copy, a project with no effects, overlays or subtitles is remuxed as-is, but only
+        when the source already holds what the re-encode would produce (H.264 video, AAC audio).
+        threads=None uses every core when auto_threads is on; pass a share when running several exports at once.
+        """
         if not self.sources:
             raise RuntimeError("No sources added")
+        filter_complex, v_label, a_label = self._assemble_filter_complex()
+        pooped = self.preset_params.get("pooped_transcript")
         cmd = [self.ffmpeg]
         if overwrite:
             cmd += ["-y"]
-        # inputs: main + overlays
-        cmd += ["-i", str(self.sources[0])]
-        for ov in self.overlays:
-            cmd += ["-i", str(ov["path"])]
-        filter_complex, v_label, a_label = self._assemble_filter_complex()
-        if filter_complex:
-            cmd += ["-filter_complex", filter_complex]
-            cmd += ["-map", f"[{v_label}]"]
-            cmd += ["-map", f"[{a_label}]"]
+        if stream_copy and not filter_complex and not pooped and self._can_stream_copy(self.sources[0], output_path):
+            # nothing to filter: copy the streams instead of decoding and re-encoding them
+            cmd += ["-i", str(self.sources[0]), "-map", "0:v", "-map", "0:a?", "-c", "copy", str(output_path)]
         else:
-            cmd += ["-map", "0:v", "-map", "0:a?"]
-        # subtitles
-        pooped = self.preset_params.get("pooped_transcript")
-        if pooped:
-            srt = self._write_srt_from_transcript(pooped)
+            encoder = video_encoder or _detect_hw_encoder(self.ffmpeg)
+            # inputs: main + overlays
+            if hwaccel:
+                cmd += ["-hwaccel", "auto"]
+            cmd += ["-i", str(self.sources[0])]
+            for ov in self.overlays:
+                cmd += self._overlay_input_args(ov)
+                cmd += ["-i", str(ov["path"])]
+            srt = self._write_srt_from_transcript(pooped) if pooped else None
             if srt:
-                # add subtitles via subtitles filter; if filter_complex present, chain is required (best-effort)
-                if filter_complex:
-                    # append subtitles to filter_complex by wrapping final video label through subtitles filter
-                    # due to complexity we fallback to -vf subtitles= if safe (best-effort)
-                    cmd += ["-vf", f"subtitles={str(srt)}"]
-                else:
-                    cmd += ["-vf", f"subtitles={str(srt)}"]
-        cmd += ["-c:v", "libx264", "-preset", preset, "-crf", str(crf), "-c:a", "aac", "-b:a", "192k", str(output_path)]
+                # burn the subtitles in as the last node of the graph; a separate -vf can't be combined with it
+                sub = f"[{v_label}]subtitles={_filter_arg(srt.as_posix())}[v_sub]"
+                filter_complex = f"{filter_complex};{sub}" if filter_complex else sub
+                v_label = "v_sub"
+            if filter_complex and len(filter_complex) > _FILTER_SCRIPT_MIN_CHARS:
+                # long graphs go through a script file so the command line stays under ARG_MAX
+                script = self.temp_dir / f"fc_{uuid.uuid4().hex[:8]}.txt"
+                script.write_text(filter_complex, encoding="utf-8")
+                cmd += ["-filter_complex_script", str(script)]
+            elif filter_complex:
+                cmd += ["-filter_complex", filter_complex]
+            # streams no filter touched are still the raw input specifiers, which -map takes unbracketed
+            cmd += ["-map", f"[{v_label}]" if v_label != "0:v" else "0:v"]
+            cmd += ["-map", f"[{a_label}]" if a_label != "0:a" else "0:a?"]
+            cmd += _video_codec_args(encoder, crf, preset)
+            if threads is not None:
+                cmd += ["-threads", str(threads)]
+            elif self.auto_threads:
+                cmd += ["-threads", str(os.cpu_count() or 0)]
+            cmd += ["-c:a", "aac", "-b:a", "192k", str(output_path)]
         # plugin hook before returning command
-        if self.plugin_manager:
+        if self.plugin_manager and self.plugin_manager.has_hook("on_before_export"):
             try:
                 self.plugin_manager.run_hook_all("on_before_export", self, cmd)
             except Exception:
                 pass
         return cmd
 
-    def export(self, output_path: str, **ffmpeg_kwargs) -> subprocess.CompletedProcess:
+    def _can_stream_copy(self, src: Path, output_path: str) -> bool:
+        """True if remuxing src gives the same codecs the export would encode to, in a container that takes them."""
+        if Path(output_path).suffix.lower() not in _COPY_CONTAINERS:
+            return False
+        try:
+            streams = self._probe_all(src).get("streams", [])
+        except Exception:
+            return False
+        video = [st.get("codec_name") for st in streams if st.get("codec_type") == "video"]
+        audio = [st.get("codec_name") for st in streams if st.get("codec_type") == "audio"]
+        return bool(video) and all(c == "h264" for c in video) and all(c == "aac" for c in audio)
+
+    def _prepare_export(self, output_path: str, **ffmpeg_kwargs) -> List[str]:
         # allow vocoder plugin to run pre-processing
-        if self.plugin_manager:
+        if self.plugin_manager and self.plugin_manager.has_hook("on_preprocess_audio"):
             try:
                 self.plugin_manager.run_hook_all("on_preprocess_audio", self)
             except Exception:
                 pass
         cmd = self.generate_command(output_path, **ffmpeg_kwargs)
         # allow plugins to inspect/modify the command
-        if self.plugin_manager:
+        if self.plugin_manager and self.plugin_manager.has_hook("on_run_export"):
             try:
                 self.plugin_manager.run_hook_all("on_run_export", self, cmd)
             except Exception:
                 pass
-        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-        return p
+        return cmd
+
+    def export(self, output_path: str, **ffmpeg_kwargs) -> subprocess.CompletedProcess:
+        cmd = self._prepare_export(output_path, **ffmpeg_kwargs)
+        # -nostats keeps the per-frame status lines out of the buffered stderr
+        cmd[1:1] = ["-nostats"]
+        return _run_captured(cmd, self._running)
 
-    def batch_export(self, jobs: List[Tuple[str, Dict]] ) -> List[Dict]:
+    def export_with_progress(self, output_path: str, on_progress: Optional[Callable[[Dict[str, str]], None]] = None,
+                             **ffmpeg_kwargs) -> subprocess.CompletedProcess:
         """
-        jobs: list of (output_path, override_effects) - override_effects merges into self.effects for that run
-        returns list of {'out': out, 'returncode': rc, 'stderr': stderr}
+        Run the export, calling on_progress(report) for each ffmpeg progress report
+        (keys such as out_time, out_time_us, frame, speed, progress).
+        Blocks until ffmpeg exits; returns a CompletedProcess whose stderr holds ffmpeg's log.
         """
-        results = []
-        for out, overrides in jobs:
-            # snapshot effects
-            old = dict(self.effects)
+        cmd = self._prepare_export(output_path, **ffmpeg_kwargs)
+        cmd[1:1] = ["-progress", "pipe:1", "-nostats"]
+        # don't flash a console window per export on Windows
+        creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+        # stderr goes to a temp file rather than a second pipe so neither stream can stall ffmpeg
+        with tempfile.TemporaryFile() as err:
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=err,
+                                    bufsize=1, universal_newlines=True, creationflags=creationflags)
+            self._running.add(proc)
             try:
-                if overrides:
-                    self.effects.update(overrides)
-                res = self.export(out)
-                results.append({'out': out, 'returncode': res.returncode, 'stderr': res.stderr})
+                with proc.stdout:
+                    for report in parse_progress(proc.stdout):
+                        if on_progress is not None:
+                            on_progress(report)
+                rc = proc.wait()
             finally:
-                self.effects = old
+                self._running.discard(proc)
+            err.seek(0)
+            stderr = err.read().decode("utf-8", "replace")
+        return subprocess.CompletedProcess(cmd, rc, None, stderr)
+
+    def batch_export(self, jobs: List[Tuple[str, Dict]], max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        jobs: list of (output_path, override_effects) - override_effects merges into self.effects for that run
+        returns list of {'out': out, 'returncode': rc, 'stderr': stderr}
+        Jobs run in worker processes (default: half the cores, since each ffmpeg is itself multithreaded).
+        """
+        if not jobs:
+            return []
+        base = self.export_project_state()
+        # pin the scramble order so every worker (each a fresh adaptor) shuffles like this one
+        base_effects = {"scramble_seed": self._seed, **base["effects"]}
+        job_effects = [{**base_effects, **(overrides or {})} for _, overrides in jobs]
+        # only the main source feeds the graph, and only stutter/scramble need its duration:
+        # probe it here, once, and hand the result to the workers instead of each re-probing
+        if any(e.get("stutter") or e.get("scramble") for e in job_effects):
+            self.ffprobe_durations(self.sources[:1])
+        probe_cache = dict(self._probe_cache)
+        workers = min(max_workers or max(1, (os.cpu_count() or 2) // 2), len(jobs))
+        # concurrent ffmpegs split the cores instead of each being told to use all of them
+        threads = max(1, (os.cpu_count() or 1) // workers) if self.auto_threads and workers > 1 else None
+        # the encoder probe is only cached per process; run it here rather than once per worker
+        encoder = _detect_hw_encoder(self.ffmpeg)
+        states = []
+        for effects in job_effects:
+            # per-job snapshot; self.effects is never touched
+            states.append(dict(base, ffmpeg=self.ffmpeg, ffplay=self.ffplay, ffprobe=self.ffprobe,
+                               auto_threads=self.auto_threads, threads=threads, video_encoder=encoder,
+                               probe_cache=probe_cache,
+                               effects=effects))
+        outs = [out for out, _ in jobs]
+        if workers == 1:
+            return [_run_single_job(st, out) for st, out in zip(states, outs)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_run_single_job, states, outs))
+
+    async def batch_export_async(self, jobs: List[Tuple[str, Dict]], **ffmpeg_kwargs) -> List[Dict]:
+        """
+        Same jobs/results as batch_export, run as a probe -> build command -> ffmpeg pipeline
+        in this process. Stages hand off through small bounded queues, so the next job's
+        probe and command build happen while the previous job is still encoding.
+        """
+        results: List[Dict] = [{} for _ in jobs]
+        probed: asyncio.Queue = asyncio.Queue(maxsize=2)
+        built: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        async def probe_stage():
+            for i, (out, overrides) in enumerate(jobs):
+                job, err = self.with_effects(overrides), None
+                try:
+                    # as in batch_export: only stutter/scramble need the main source's duration
+                    if job.sources and (job.effects.get("stutter") or job.effects.get("scramble")):
+                        await asyncio.to_thread(job._probe_all, job.sources[0])
+                except Exception as e:
+                    err = e
+                await probed.put((i, out, job, err))
+            await probed.put(None)
+
+        async def build_stage():
+            while True:
+                item = await probed.get()
+                if item is None:
+                    break
+                i, out, job, err = item
+                cmd = None
+                if err is None:
+                    try:
+                        cmd = await asyncio.to_thread(job._prepare_export, out, **ffmpeg_kwargs)
+                    except Exception as e:
+                        err = e
+                await built.put((i, out, cmd, err))
+            await built.put(None)
+
+        async def run_stage():
+            while True:
+                item = await built.get()
+                if item is None:
+                    break
+                i, out, cmd, err = item
+                if err is None:
+                    cmd[1:1] = ["-nostats"]
+                    try:
+                        proc = await asyncio.create_subprocess_exec(
+                            *cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                        try:
+                            _, stderr = await proc.communicate()
+                        except asyncio.CancelledError:
+                            # cancelling the coroutine doesn't stop the child; don't leave ffmpeg encoding
+                            if proc.returncode is None:
+                                proc.kill()
+                                await proc.wait()
+                            raise
+                        results[i] = {'out': out, 'returncode': proc.returncode,
+                                      'stderr': stderr.decode("utf-8", "replace")}
+                        continue
+                    except OSError as e:
+                        err = e
+                results[i] = {'out': out, 'returncode': -1, 'stderr': str(err)}
+
+        await asyncio.gather(probe_stage(), build_stage(), run_stage())
         return results
 
     def _write_srt_from_transcript(self, text: str) -> Optional[Path]:
         try:
-            lines = [ln.strip() for ln in text.replace("\r", "").split("\n") if ln.strip()]
-            if not lines:
-                return None
-            sents = []
-            for ln in lines:
-                for s in ln.split("."):
-                    s = s.strip()
-                    if s:
-                        sents.append(s)
+            sents = [s for s in (s.strip() for s in _SENT_RE.split(text)) if s]
             if not sents:
-                sents = lines
-            per = 3.0
+                # nothing but periods: fall back to one cue per non-blank line
+                sents = [ln for ln in (ln.strip() for ln in text.splitlines()) if ln]
+                if not sents:
+                    return None
+            per_ms = 3000
+            # cue boundaries are whole multiples of per_ms, so format each once in integer ms
+            stamps = []
+            for t in range(0, (len(sents) + 1) * per_ms, per_ms):
+                sec, ms = divmod(t, 1000); m, ssec = divmod(sec, 60); h, m = divmod(m, 60)
+                stamps.append(f"{h:02d}:{m:02d}:{ssec:02d},{ms:03d}")
             srt_path = self.temp_dir / (f"pooped_{uuid.uuid4().hex[:8]}.srt")
-            with srt_path.open("w", encoding="utf-8") as fh:
-                for i, s in enumerate(sents, start=1):
-                    start = (i - 1) * per
-                    end = start + per
-                    def fmt(t):
-                        h = int(t // 3600); m = int((t % 3600)//60); ssec = int(t%60); ms = int((t-int(t))*1000)
-                        return f"{h:02d}:{m:02d}:{ssec:02d},{ms:03d}"
-                    fh.write(f"{i}\n{fmt(start)} --> {fmt(end)}\n{s}\n\n")
+            srt_path.write_text("".join(f"{i}\n{stamps[i - 1]} --> {stamps[i]}\n{s}\n\n"
+                                        for i, s in enumerate(sents, start=1)), encoding="utf-8")
             return srt_path
         except Exception:
             return None
 
-    def preview(self):
+    def preview(self) -> subprocess.Popen:
+        """Play the main source in ffplay, replacing any preview that is still running."""
         if not self.sources:
             raise RuntimeError("No source")
-        subprocess.Popen([self.ffplay, "-autoexit", "-nodisp", str(self.sources[0])])
+        self.stop_preview()
+        self._preview_proc = subprocess.Popen([self.ffplay, "-autoexit", "-nodisp", str(self.sources[0])],
+                                              stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL)
+        return self._preview_proc
 
-    def cleanup(self):
+    def terminate_exports(self):
+        """Kill every export ffmpeg this adaptor (or a with_effects copy) still has running."""
+        for proc in list(self._running):
+            if proc.poll() is None:
+                proc.kill()
+
+    def stop_preview(self):
+        proc, self._preview_proc = self._preview_proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        proc.terminate()
         try:
-            for p in list(self.temp_dir.iterdir()):
-                try: p.unlink()
-                except Exception: pass
-            try: self.temp_dir.rmdir()
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def cleanup(self):
+        self.stop_preview()
+        if self._ydl is not None:
+            try: self._ydl.close()
             except Exception: pass
-        except Exception:
-            pass
\ No newline at end of file
+            self._ydl = None
+        # also removes nested dirs/.part leftovers from yt-dlp that unlink() couldn't
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+def _run_single_job(state: Dict[str, Any], out: str) -> Dict[str, Any]:
+    """batch_export worker: rebuild an adaptor from a picklable project snapshot and export one file."""
+    job = YTPFFmpegAdaptor(state["ffmpeg"], state["ffplay"], state["ffprobe"],
+                           auto_threads=state.get("auto_threads", True))
+    try:
+        job.load_project_state(state)
+        job._probe_cache.update(state.get("probe_cache", {}))
+        res = job.export(out, threads=state.get("threads"), video_encoder=state.get("video_encoder"))
+        return {'out': out, 'returncode': res.returncode, 'stderr': res.stderr}
+    finally:
+        job.cleanup()